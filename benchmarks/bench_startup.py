@@ -0,0 +1,64 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Headless benchmark of the InfoBarTimers plugin import time.
+#
+# Each run imports the plugin, with the enigma2 stand-ins from
+# enigma_stubs.py, in a fresh Python interpreter so that no module is already
+# loaded.  The time to apply the translated Setup screen choice labels, which
+# is deferred until the Setup screen is first opened, is reported separately.
+#
+# 	python benchmarks/bench_startup.py
+# 	python benchmarks/bench_startup.py --repeat 20
+#
+from argparse import ArgumentParser
+from os.path import abspath, dirname, join
+from subprocess import check_output
+from sys import executable
+
+BENCH_PATH = dirname(abspath(__file__))
+PYTHON_PATH = join(dirname(BENCH_PATH), "usr", "lib", "enigma2", "python")
+DEFAULT_REPEAT = 10
+
+CHILD = """
+from sys import path
+path.insert(0, %r)
+import enigma_stubs
+path.insert(0, %r)
+from importlib import import_module
+from time import perf_counter
+start = perf_counter()
+plugin = import_module("Plugins.Extensions.InfoBarTimers.plugin")
+imported = perf_counter()
+getattr(plugin, "applyChoiceLabels", lambda: None)()  # Older releases built the labels on import.
+labelled = perf_counter()
+print("RESULT %%f %%f" %% ((imported - start) * 1000.0, (labelled - imported) * 1000.0))
+""" % (BENCH_PATH, PYTHON_PATH)
+
+
+def run():
+	for line in check_output([executable, "-c", CHILD]).decode("UTF-8").splitlines():
+		if line.startswith("RESULT "):
+			return [float(x) for x in line.split()[1:]]
+	raise RuntimeError("The plugin import didn't report a result!")
+
+
+def report(name, values):
+	values = sorted(values)
+	print("%-24s %10.3f %10.3f %10.3f" % (name, values[0], values[len(values) // 2], values[-1]))
+
+
+def main():
+	parser = ArgumentParser(description="Benchmark the InfoBarTimers plugin import time.")
+	parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="number of interpreters started (default: %(default)s)")
+	args = parser.parse_args()
+	results = [run() for x in range(args.repeat)]
+	print("InfoBarTimers plugin import benchmark, %d runs." % args.repeat)
+	print()
+	print("%-24s %10s %10s %10s" % ("Benchmark (ms)", "Best", "Median", "Worst"))
+	report("Plugin import", [x[0] for x in results])
+	report("Setup choice labels", [x[1] for x in results])
+
+
+if __name__ == "__main__":
+	main()
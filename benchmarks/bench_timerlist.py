@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Headless benchmarks for the InfoBarTimers list building hot path.
+#
+# The enigma2 modules are replaced by the stand-ins in enigma_stubs.py and
+# the timers come from a synthetic RecordTimer so that the benchmarks can be
+# run on any Linux system, for example:
+#
+# 	python benchmarks/bench_timerlist.py
+# 	python benchmarks/bench_timerlist.py --sizes 100,1000 --repeat 10
+#
+# The timers are selected and formatted by a timer snapshot service with an
+# overlay and a Show screen consumer, as on a receiver.  Rows that a refresh
+# leaves for the Show screen to request are timed as they are completed.
+#
+# The reported figures are the best of the repeated runs and can be compared
+# across releases of the plugin.  With --memory the memory allocated for the
+# rows, per row, is measured with tracemalloc, both for a first list build
+# and for a refresh of the list when nothing has changed.
+#
+from argparse import ArgumentParser
+from importlib import import_module
+from os.path import abspath, dirname, join
+from sys import path
+from time import perf_counter, time
+from tracemalloc import get_traced_memory, start, stop
+
+BENCH_PATH = dirname(abspath(__file__))
+path.insert(0, BENCH_PATH)
+path.insert(0, join(dirname(BENCH_PATH), "usr", "lib", "enigma2", "python"))
+
+import enigma_stubs  # noqa: E402  This must be imported before the plugin.
+
+plugin = import_module("Plugins.Extensions.InfoBarTimers.plugin")
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 50000)
+DEFAULT_REPEAT = 5
+OVERLAY_ENTRIES = 10
+SHOW_PAGE = 13  # Rows of the first Show screen page, which are always fully formatted.
+PICON_SIZE = (63, 38)
+SERVICES = 50
+
+
+class ServiceReference:
+	def __init__(self, number):
+		self.ref = self
+		self.number = number
+
+	def toString(self):
+		return "1:0:19:%X:1:1:C00000:0:0:0:" % self.number
+
+	def getServiceName(self):
+		return "Service %d" % self.number
+
+
+class FrontendInfo:
+	def __init__(self, tuner):
+		self.tuner = tuner
+
+	def getFrontendInfo(self, what):
+		return self.tuner
+
+	def getAll(self, original):
+		return {
+			"tuner_number": self.tuner,
+			"tuner_type": "DVB-T",
+			"tuner_bit_error_rate": 0,
+			"tuner_signal_quality": 52428,
+			"tuner_signal_quality_db": 2350,
+			"tuner_signal_power": 45875
+		}
+
+
+class RecordService:
+	def __init__(self, tuner):
+		self.info = FrontendInfo(tuner)
+
+	def frontendInfo(self):
+		return self.info
+
+
+class Timer:
+	StateWaiting = 0
+	StatePrepared = 1
+	StateRunning = 2
+	StateEnded = 3
+	StateFailed = 4
+
+	def __init__(self, number, begin, end, state, disabled=False):
+		self.name = "Timer %d" % number
+		self.description = "Synthetic timer %d" % number
+		self.begin = begin
+		self.end = end
+		self.state = state
+		self.disabled = disabled
+		self.service_ref = ServiceReference(number % SERVICES)
+		self.record_service = RecordService(number % 4) if state == self.StateRunning else None
+		self.prepare_time = 20
+		self.repeated = 127 if number % 11 == 0 else 0
+		self.tags = ["News", "HD"] if number % 3 == 0 else []
+		self.dirname = None
+		if number % 5 == 0:
+			self.isAutoTimer = True
+
+	def getNextActivation(self):
+		return self.begin - self.prepare_time if self.state == self.StateWaiting else self.end
+
+
+# A RecordTimer with "processed" finished timers (one in seven disabled),
+# four running timers and "pending" waiting timers.  As on a real receiver
+# the processed timers are in order of completion and the pending timers in
+# order of their next activation.
+#
+class RecordTimer:
+	def __init__(self, processed, pending):
+		now = int(time())
+		self.processed_timers = [Timer(number, now - (processed - number) * 1800 - 1800, now - (processed - number) * 1800, Timer.StateEnded, disabled=(number % 7 == 0)) for number in range(processed)]
+		running = [Timer(processed + number, now - 600 * (number + 1), now + 900 * (number + 1), Timer.StateRunning) for number in range(4)]
+		waiting = [Timer(processed + 4 + number, now + (number + 1) * 1800, now + (number + 2) * 1800, Timer.StateWaiting) for number in range(pending)]
+		self.timer_list = sorted(running, key=lambda x: x.getNextActivation()) + waiting
+		self.on_state_change = []
+
+
+# A stand-in for the overlay and the Show screen as consumers of the timer
+# snapshot service.  Every template field is displayed.
+#
+class Consumer:
+	def __init__(self, ended, waiting, disabled, icons):
+		self.quotas = (ended, waiting, disabled)
+		self.icons = icons
+		self.snapshot = None
+
+	def __getitem__(self, name):  # The service only uses the "icons" widget.
+		return self.icons
+
+	def isSnapshotActive(self):
+		return True
+
+	def getSnapshotRequirements(self):
+		return self.quotas + (plugin.ALL_FIELDS, PICON_SIZE, 0)
+
+	def snapshotChanged(self, snapshot):
+		self.snapshot = snapshot
+
+
+# Return the best time of the repeated runs of function.  If setup is given
+# it is called, untimed, before each run and its result is passed to function.
+#
+def bench(function, repeat, setup=None):
+	best = None
+	for run in range(repeat):
+		argument = setup() if setup else None
+		start = perf_counter()
+		result = function(argument) if setup else function()
+		elapsed = perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	return best, result
+
+
+def newService(recordTimer, consumers, refresh=True):
+	service = plugin.TimerSnapshotService()
+	for consumer in consumers:
+		service.addConsumer(consumer, recordTimer)
+	if refresh:
+		service.refresh()
+	return service
+
+
+# Return the memory allocated by the builds of a timer list that is still in
+# use after each build.  All the lists are kept so that the memory of a list
+# that is reused by a later build is only counted once.
+#
+def measure(builds):
+	lists = []
+	allocated = []
+	start()
+	try:
+		for build in builds:
+			before = get_traced_memory()[0]
+			lists.append(build())
+			allocated.append(get_traced_memory()[0] - before)
+	finally:
+		stop()
+	return allocated, lists
+
+
+def report(name, size, elapsed, rows):
+	rate = rows / elapsed if elapsed else 0.0
+	print("%-26s %8d %12.3f %10d %14.0f" % (name, size, elapsed * 1000.0, rows, rate))
+
+
+def main():
+	parser = ArgumentParser(description="Benchmark the InfoBarTimers list building hot path.")
+	parser.add_argument("--sizes", default=",".join([str(x) for x in DEFAULT_SIZES]), help="comma separated numbers of processed and pending timers (default: %(default)s)")
+	parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="number of runs of which the best is reported (default: %(default)s)")
+	parser.add_argument("--quota", type=int, default=None, help="number of timers selected from each category for the Show screen benchmarks, -1 selects all timers (default: the Show screen settings)")
+	parser.add_argument("--entries", type=int, default=OVERLAY_ENTRIES, help="number of overlay rows for the trimming benchmark (default: %(default)s)")
+	parser.add_argument("--memory", action="store_true", help="also measure the memory allocated per row")
+	args = parser.parse_args()
+	sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+	settings = plugin.config.plugins.InfoBarTimers
+	icons = enigma_stubs.MultiPixmap()
+	if args.quota is None:
+		show = Consumer(settings.endedShow.value, settings.waitingShow.value, settings.disabledShow.value, icons)
+	else:
+		show = Consumer(args.quota, args.quota, args.quota, icons)
+	overlay = Consumer(settings.endedOverlay.value, settings.waitingOverlay.value, settings.disabledOverlay.value, icons)
+	consumers = (overlay, show)
+	print("InfoBarTimers %s list building benchmarks, best of %d runs." % (plugin.VERSION, args.repeat))
+	print()
+	print("%-26s %8s %12s %10s %14s" % ("Benchmark", "Timers", "Time (ms)", "Rows", "Rows/second"))
+	memory = []
+	for size in sizes:
+		recordTimer = RecordTimer(size, size)
+		ended, waiting, disabled = show.quotas
+		elapsed, selected = bench(lambda: plugin.selectTimers(recordTimer, ended=ended, waiting=waiting, disabled=disabled), args.repeat)
+		listed = selected["a"] + selected["d"] + selected["e"] + selected["w"]
+		report("selectTimers", size, elapsed, len(listed))
+		elapsed, picons = bench(lambda: plugin.getPicons(listed, PICON_SIZE, plugin.ALL_FIELDS), args.repeat)
+		report("getPicons", size, elapsed, len(picons))
+		elapsed, service = bench(lambda: newService(recordTimer, consumers), args.repeat)
+		report("refresh (cold)", size, elapsed, len(service.snapshot.rows))
+		elapsed, rows = bench(lambda: service.refresh() or service.snapshot.rows, args.repeat)
+		report("refresh (cached)", size, elapsed, len(rows))
+		elapsed, rows = bench(lambda x: x.completeTimers(listed) or x.snapshot.rows, args.repeat, setup=lambda: newService(recordTimer, consumers))
+		report("completeTimers (deferred)", size, elapsed, len(rows))
+		ended, waiting, disabled = overlay.quotas
+		order, reverse = settings.orderOverlay.value, settings.sortOverlay.value
+		elapsed, rows = bench(lambda: overlay.snapshot.getRows(plugin.orderTimers(plugin.trimTimers(overlay.snapshot.getTimers(ended=ended, waiting=waiting, disabled=disabled), args.entries), order=order, reverse=reverse), args.entries), args.repeat)
+		report("getRows (overlay)", size, elapsed, len(rows))
+		ended, waiting, disabled = show.quotas
+		order, reverse = settings.orderShow.value, settings.sortShow.value
+
+		def showRows(service):
+			timers = plugin.orderTimers(service.snapshot.getTimers(ended=ended, waiting=waiting, disabled=disabled), order=order, reverse=reverse)
+			return service.snapshot.getRows(timers, SHOW_PAGE)
+
+		elapsed, rows = bench(showRows, args.repeat, setup=lambda: newService(recordTimer, consumers))
+		report("getRows (Show page)", size, elapsed, len(rows))
+		service.detach()
+		print()
+		if args.memory:
+			rowCache = plugin.TimerRowCache()
+			allocated, lists = measure([lambda: plugin.formatTimerList(listed, icons, rowCache=rowCache)] * 2)
+			memory.append((size, len(lists[0]), allocated))
+	if memory:
+		print("%-26s %8s %10s %14s %14s" % ("Row memory", "Timers", "Rows", "Build (B/row)", "Refresh (B/row)"))
+		for size, rows, allocated in memory:
+			print("%-26s %8d %10d %14.0f %14.0f" % ("formatTimerList", size, rows, allocated[0] / float(rows or 1), allocated[1] / float(rows or 1)))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,240 @@
+# Minimal stand-ins for the enigma2 modules imported by the InfoBarTimers
+# plugin.  Importing this module registers them in sys.modules so that
+# plugin.py can be loaded and exercised on a plain Linux system.  Only the
+# parts of each API that the plugin actually uses are provided.
+#
+import builtins
+import gettext
+import sys
+import types
+
+builtins._ = gettext.gettext
+builtins.ngettext = gettext.ngettext
+
+
+def module(name, **attrs):
+	mod = types.ModuleType(name)
+	mod.__dict__.update(attrs)
+	sys.modules[name] = mod
+	return mod
+
+
+class Size:
+	def __init__(self, w, h):
+		self.w, self.h = w, h
+
+	def width(self):
+		return self.w
+
+	def height(self):
+		return self.h
+
+
+class Desktop:
+	def size(self):
+		return Size(1920, 1080)
+
+
+class eTimer:
+	def __init__(self):
+		self.callback = []
+		self.active = False
+		self.interval = None
+
+	def start(self, ms, single=False):
+		self.active = True
+		self.interval = ms
+
+	def startLongTimer(self, secs):
+		self.start(secs * 1000, True)
+
+	def stop(self):
+		self.active = False
+
+	def isActive(self):
+		return self.active
+
+	def fire(self):  # Run the timer callbacks as if the timer had expired.
+		self.active = False
+		for callback in self.callback:
+			callback()
+
+
+class iFrontendInformation:
+	frontendNumber = 5
+
+
+class eListboxPythonMultiContent:
+	TYPE_TEXT = 0
+	TYPE_PROGRESS = 1
+	TYPE_PIXMAP = 2
+	TYPE_PIXMAP_ALPHATEST = 3
+	TYPE_PIXMAP_ALPHABLEND = 4
+	TYPE_PROGRESS_PIXMAP = 5
+
+
+module("enigma", ePoint=lambda x, y: (x, y), eSize=lambda w, h: Size(w, h), eTimer=eTimer, getDesktop=lambda n: Desktop(), eListboxPythonMultiContent=eListboxPythonMultiContent, iFrontendInformation=iFrontendInformation)
+module("Components")
+
+
+class Notifiable:
+	def __init__(self, default):
+		self.default = default
+		self._value = default
+		self.saved_value = None
+		self.notifiers = []
+
+	def getValue(self):
+		return self._value
+
+	def setValue(self, value):
+		self._value = value
+		for notifier in self.notifiers[:]:
+			notifier(self)
+
+	value = property(getValue, setValue)
+
+	def addNotifier(self, notifier, initial_call=True, immediate_feedback=True):
+		self.notifiers.append(notifier)
+		if initial_call:
+			notifier(self)
+
+	def removeNotifier(self, notifier):
+		self.notifiers.remove(notifier)
+
+	def save(self):
+		self.saved_value = str(self._value)
+
+
+class ConfigSelection(Notifiable):
+	def __init__(self, default=None, choices=None):
+		self.choices = choices or []
+		Notifiable.__init__(self, default)
+
+	def setChoices(self, choices, default=None):
+		self.choices = choices
+
+
+class ConfigSubsection:
+	pass
+
+
+config = ConfigSubsection()
+config.plugins = ConfigSubsection()
+config.usage = ConfigSubsection()
+config.usage.timerlist_finished_timer_position = Notifiable("end")
+config.usage.date = ConfigSubsection()
+config.usage.date.dayshort = Notifiable("%a %d/%m")
+config.usage.time = ConfigSubsection()
+config.usage.time.short = Notifiable("%H:%M")
+config.usage.elapsed_time_positive_osd = Notifiable(False)
+config.usage.swap_time_remaining_on_osd = Notifiable("0")
+module("Components.config", config=config, ConfigSubsection=ConfigSubsection, ConfigSelection=ConfigSelection,
+	ConfigEnableDisable=lambda default: Notifiable(default), ConfigYesNo=lambda default: Notifiable(default),
+	ConfigInteger=lambda default, limits=None: Notifiable(default), ConfigSequence=lambda default, seperator=None, limits=None: Notifiable(default))
+
+
+class Callable:
+	def __init__(self, *args, **kwargs):
+		self.args = args
+		self.kwargs = kwargs
+
+
+class MultiPixmap:
+	def __init__(self):
+		self.pixmaps = ["pixmap%d" % x for x in range(9)]
+
+	def hide(self):
+		pass
+
+
+class List:
+	def __init__(self, list=None):
+		self.list = list or []
+		self.downstream_elements = []
+		self.style = "default"
+		self.modified = 0
+		self.updated = 0
+		self.onSelectionChanged = []
+		self.index = 0
+
+	def updateList(self, list):
+		self.list = list
+		self.updated += 1
+
+	def modifyEntry(self, index, data):
+		self.list[index] = data
+		self.modified += 1
+
+	def setStyle(self, style):
+		self.style = style
+
+	def getStyle(self):
+		return self.style
+
+	def getIndex(self):
+		return self.index
+
+	getCurrentIndex = getIndex
+
+
+class PluginList:
+	pluginList = []
+
+
+module("Components.ActionMap", HelpableActionMap=Callable, ActionMap=Callable)
+module("Components.Pixmap", MultiPixmap=MultiPixmap)
+module("Components.PluginComponent", plugins=PluginList())
+module("Components.Renderer")
+module("Components.Renderer.Picon", getPiconName=lambda ref: "", searchPaths=[])
+module("Components.Sources")
+module("Components.Sources.List", List=List)
+module("Components.Language", language=types.SimpleNamespace(addCallback=lambda cb: None))
+
+
+class PluginDescriptor(Callable):
+	WHERE_EXTENSIONSMENU = 1
+	WHERE_PLUGINMENU = 2
+	WHERE_SESSIONSTART = 3
+	WHERE_INFOBARLOADED = 4
+
+
+class Screen:
+	def __init__(self, session, parent=None):
+		self.session = session
+		self.onLayoutFinish = []
+		self.onClose = []
+		self.widgets = {}
+
+	def __setitem__(self, key, value):
+		self.widgets[key] = value
+
+	def __getitem__(self, key):
+		return self.widgets[key]
+
+	def getTitle(self):
+		return ""
+
+	def setTitle(self, title):
+		pass
+
+	def show(self):
+		pass
+
+	def hide(self):
+		pass
+
+	def close(self, *args):
+		pass
+
+
+module("Plugins.Plugin", PluginDescriptor=PluginDescriptor)
+module("Screens")
+module("Screens.HelpMenu", HelpableScreen=type("HelpableScreen", (), {"__init__": lambda self: None}))
+module("Screens.InfoBarGenerics", InfoBarShowHide=object, isMoviePlayerInfoBar=lambda x: False, isStandardInfoBar=lambda x: True)
+module("Screens.Screen", Screen=Screen)
+module("Screens.Setup", Setup=type("Setup", (Screen,), {"__init__": lambda self, session, setup=None, plugin=None: Screen.__init__(self, session)}))
+module("Screens.MessageBox", MessageBox=Callable)
+module("Tools")
+module("Tools.Directories", SCOPE_CURRENT_PLUGIN=1, SCOPE_CURRENT_SKIN=2, SCOPE_PLUGINS=3, resolveFilename=lambda scope, path="": path)
+module("Tools.LoadPixmap", LoadPixmap=lambda path, *args, **kwargs: ("pixmap", path))
@@ -1,4 +1,4 @@
-from gettext import bindtextdomain, dgettext, gettext
+from gettext import bindtextdomain, dgettext, dngettext, gettext, ngettext as gettextNgettext
 
 from Components.Language import language
 from Tools.Directories import SCOPE_PLUGINS, resolveFilename
@@ -6,18 +6,54 @@ from Tools.Directories import SCOPE_PLUGINS, resolveFilename
 PluginLanguageDomain = "InfoBarTimers"
 PluginLanguagePath = "Extensions/InfoBarTimers/locale"
 
+# Translations are looked up once per string, or per plural string and whole
+# number count, and kept until the language is changed.  Counts are truncated
+# to whole numbers, as they are displayed, so that counts of seconds from the
+# timer calculations don't add a new entry on every refresh.  Strings without
+# a translation in the plugin's domain fall back to the image's translation.
+# The use of an image translation is reported once per string.  Strings the
+# image doesn't translate either, such as every string on an English system,
+# are not reported.
+#
+translations = {}
+fallbacks = set()
+
 
 def localeInit():
 	bindtextdomain(PluginLanguageDomain, resolveFilename(SCOPE_PLUGINS, PluginLanguagePath))
+	translations.clear()
 
 
 def _(txt):
-	_txt = dgettext(PluginLanguageDomain, txt)
-	if _txt:
-		return _txt
-	else:
+	_txt = translations.get(txt)
+	if _txt is None:
+		_txt = dgettext(PluginLanguageDomain, txt)
+		if not _txt or _txt == txt:
+			_txt = gettext(txt)
+			if _txt != txt:
+				reportFallback(txt)
+		translations[txt] = _txt
+	return _txt
+
+
+def ngettext(singular, plural, n):
+	n = int(n)
+	key = (singular, plural, n)
+	_txt = translations.get(key)
+	if _txt is None:
+		_txt = dngettext(PluginLanguageDomain, singular, plural, n)
+		if not _txt or _txt in (singular, plural):
+			_txt = gettextNgettext(singular, plural, n)
+			if _txt not in (singular, plural):
+				reportFallback(singular)
+		translations[key] = _txt
+	return _txt
+
+
+def reportFallback(txt):
+	if txt not in fallbacks:
+		fallbacks.add(txt)
 		print("[%s] Fall back to default translation for '%s'." % (PluginLanguageDomain, txt))
-		return gettext(txt)
 
 
 localeInit()
@@ -31,25 +31,40 @@
 #
 # ===========================================================================
 
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from cProfile import Profile
+from heapq import heappush, heappushpop
+from io import StringIO
+from math import floor
 from operator import attrgetter
-from time import localtime, strftime, time
+from os import listdir, makedirs, rename, stat
+from os.path import basename, exists, join
+from queue import Empty, Queue
+from threading import Thread
+from time import localtime, perf_counter, strftime, time
+import time as timeModule  # For the current timezone, which tzset() updates.
 
-from enigma import ePoint, eSize, eTimer, getDesktop
+from enigma import eListboxPythonMultiContent, ePoint, eSize, eTimer, getDesktop, iFrontendInformation
 
 from Components.ActionMap import HelpableActionMap
 from Components.config import ConfigEnableDisable, ConfigInteger, ConfigSelection, ConfigSequence, ConfigSubsection, ConfigYesNo, config
 from Components.Pixmap import MultiPixmap
 from Components.PluginComponent import plugins
+from Components.Renderer import Picon
 from Components.Renderer.Picon import getPiconName
 from Components.Sources.List import List
 from Plugins.Plugin import PluginDescriptor
 from Screens.HelpMenu import HelpableScreen
 from Screens.InfoBarGenerics import InfoBarShowHide, isMoviePlayerInfoBar, isStandardInfoBar
+from Screens.MessageBox import MessageBox
 from Screens.Screen import Screen
 from Screens.Setup import Setup
-from Tools.Directories import SCOPE_CURRENT_PLUGIN, resolveFilename
+from Tools.Directories import SCOPE_CURRENT_PLUGIN, SCOPE_CURRENT_SKIN, resolveFilename
 from Tools.LoadPixmap import LoadPixmap
 
+from . import _, ngettext
+
 NAME = _("InfoBarTimers")
 SHOW = _("Show Timers")
 SETUP = _("InfoBarTimers Setup")
@@ -59,6 +74,42 @@ VERSION = "1.0"
 DEF_ITEMHEIGHT = 25
 DEF_ENTRIES = 10
 MIN_ENTRIES = 1
+OVERLAY_QUOTAS = range(11)
+SHOW_QUOTAS = range(-1, 101)
+REFRESH_INTERVALS = range(61)
+COALESCE_WINDOWS = (0, 100, 250, 500, 1000, 2000)  # Milliseconds.
+COALESCE_LATENCIES = (1000, 2000, 5000, 10000)  # Milliseconds.
+
+SNR_LABELS = ["", _("Q"), _("Q"), _("SNR")]
+POWER_LABELS = ["", _("S"), _("P"), _("AGC")]
+LABEL_SEPARATORS = ["", " ", ":", "=", "-", ": ", " = ", " - "]
+ALL_FIELDS = frozenset(range(44))
+SIGNAL_FIELDS = frozenset(range(4, 12))
+TIME_FIELDS = frozenset(range(28, 41))
+REFRESH_MARGIN = 0.05  # Seconds added to a calculated refresh time so that the displayed value has changed.
+NO_TUNER = (None, None, None, -1, None, None, -1, None)  # Use out-of-range values to hide the bar graphs.
+NO_ELAPSED = (None, None, None, None, None, None, None, None, None, None, None, -1, None)
+PLACEHOLDER_ROW = (None, None, None, None) + NO_TUNER + (None,) * 16 + NO_ELAPSED + (None, None, None)  # The shared empty row of a timer whose row isn't formatted.
+
+PIXMAP_CACHE_SIZE = 64  # Maximum number of decoded picons / icons kept in memory.
+PIXMAP_CACHE_CHECK = 60  # Seconds between checks of a cached image file's modification time.
+PICON_INDEX_CHECK = 60  # Seconds between checks of the picon directories' modification times.
+PICON_SKIP_PATHS = ("/media/net", "/media/autofs")  # Network mounts that, like the image's findPicon(), are not searched.
+CACHE_PATH = "/tmp/InfoBarTimers"  # Volatile storage so that the cache files don't wear the flash.
+TIME_FORMAT_CACHE_SIZE = 512  # Maximum number of formatted timestamps kept in memory.
+SIGNAL_SAMPLE_INTERVAL = 1.0  # Seconds a tuner's signal readings are shared before the tuner is queried again.
+SIGNAL_HISTORY_SIZE = 60  # Number of signal readings kept per tuner.
+SLOW_REFRESH_SAMPLES = 5  # Number of the slowest refreshes kept for the refresh statistics.
+PROFILE_LINES = 25  # Number of functions listed from the refresh profile.
+STATISTICS_FILE = join(CACHE_PATH, "statistics.txt")
+REFRESH_PHASES = ("selection", "picons", "pixmaps", "formatting", "layout", "update")
+BACKGROUND_ROWS = 100  # Number of row static parts built at once before the rest are built in the background.
+FORMAT_WORKERS = 2  # Number of background row formatting threads.
+FORMAT_CHUNK = 50  # Number of rows formatted per background job.
+FORMAT_POLL = 50  # Milliseconds between checks for background formatting results.
+VIRTUAL_PREFETCH = 1  # Number of pages formatted either side of the selected row of a virtual Show list.
+VIRTUAL_EVICT = 3  # Number of pages from the selected row beyond which the rows of a virtual Show list are released.
+TIMER_INDEX_RESYNC = 300  # Seconds after which the timer index is rebuilt in case timers were edited without a notification.
 
 # Icon images are derived from a skin based MultiPixmap rather than hard coding them.
 #
@@ -71,6 +122,7 @@ ICON_FAIL = 5
 ICON_END = 6
 ICON_AUTO = 7
 ICON_REP = 8
+ICON_ICETV = -1  # The IceTV icon isn't in the MultiPixmap, it is loaded from the skin or the IceTV plugin.
 
 DESKTOP_SIZE = (getDesktop(0).size().width(), getDesktop(0).size().height())
 
@@ -141,6 +193,32 @@ styleChoices = [
 	("default", "Default")
 ]
 
+# The entry count and refresh interval choice labels are only seen in the
+# Setup screen.  So that the plugin imports quickly these settings are created
+# with plain number labels and applyChoiceLabels() replaces them with the
+# translated labels when the Setup screen is first opened.  The choice values,
+# and so the stored settings, are the same either way.
+#
+def getNumberChoices(values):
+	return [(x, str(x)) for x in values]
+
+
+def getEntryChoices(values):
+	return [(x, ngettext("%d Entry", "%d Entries", x) % x) for x in values]
+
+
+def getIntervalChoices(values):
+	return [(x, ngettext("%d Second", "%d Seconds", x) % x if x else _("Disabled")) for x in values]
+
+
+def getWindowChoices(values):
+	return [(x, _("%d ms") % x if x else _("Disabled")) for x in values]
+
+
+def getLatencyChoices(values):
+	return [(x, ngettext("%d Second", "%d Seconds", x // 1000) % (x // 1000)) for x in values]
+
+
 config.plugins.InfoBarTimers = ConfigSubsection()
 config.plugins.InfoBarTimers.enabled = ConfigEnableDisable(default=True)
 config.plugins.InfoBarTimers.moviePlayer = ConfigEnableDisable(default=False)
@@ -151,39 +229,81 @@ config.plugins.InfoBarTimers.orderOverlay = ConfigSelection(default=default, cho
 config.plugins.InfoBarTimers.orderShow = ConfigSelection(default=default, choices=orderChoices)
 config.plugins.InfoBarTimers.sortOverlay = ConfigSelection(default=0, choices=sortChoices)
 config.plugins.InfoBarTimers.sortShow = ConfigSelection(default=0, choices=sortChoices)
-config.plugins.InfoBarTimers.endedOverlay = ConfigSelection(default=3, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(11)])
-config.plugins.InfoBarTimers.endedShow = ConfigSelection(default=10, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(-1, 101)])
-config.plugins.InfoBarTimers.waitingOverlay = ConfigSelection(default=3, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(11)])
-config.plugins.InfoBarTimers.waitingShow = ConfigSelection(default=10, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(-1, 101)])
-config.plugins.InfoBarTimers.disabledOverlay = ConfigSelection(default=3, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(11)])
-config.plugins.InfoBarTimers.disabledShow = ConfigSelection(default=10, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(-1, 101)])
+config.plugins.InfoBarTimers.endedOverlay = ConfigSelection(default=3, choices=getNumberChoices(OVERLAY_QUOTAS))
+config.plugins.InfoBarTimers.endedShow = ConfigSelection(default=10, choices=getNumberChoices(SHOW_QUOTAS))
+config.plugins.InfoBarTimers.waitingOverlay = ConfigSelection(default=3, choices=getNumberChoices(OVERLAY_QUOTAS))
+config.plugins.InfoBarTimers.waitingShow = ConfigSelection(default=10, choices=getNumberChoices(SHOW_QUOTAS))
+config.plugins.InfoBarTimers.disabledOverlay = ConfigSelection(default=3, choices=getNumberChoices(OVERLAY_QUOTAS))
+config.plugins.InfoBarTimers.disabledShow = ConfigSelection(default=10, choices=getNumberChoices(SHOW_QUOTAS))
 config.plugins.InfoBarTimers.format = ConfigSelection(default=0, choices=formatChoices)
 config.plugins.InfoBarTimers.signalIndex = ConfigSelection(default=1, choices=signalChoices)
 config.plugins.InfoBarTimers.separatorIndex  = ConfigSelection(default=1, choices=separatorChoices)
 config.plugins.InfoBarTimers.position = ConfigSequence(default=overlayPositions.get(DESKTOP_SIZE[1], [50, 140]), seperator=",", limits=[(0, DESKTOP_SIZE[0]), (0, DESKTOP_SIZE[1])])
 config.plugins.InfoBarTimers.style = ConfigSelection(default="default", choices=styleChoices)
-config.plugins.InfoBarTimers.entries = ConfigSelection(default=DEF_ENTRIES, choices=[(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(MIN_ENTRIES, DEF_ENTRIES + 1)])
-config.plugins.InfoBarTimers.refreshOverlay = ConfigSelection(default=0, choices=[(0, _("Disabled"))] + [(x, ngettext("%d Second", "%d Seconds", x) % x) for x in range(1, 61)])
-config.plugins.InfoBarTimers.refreshShow = ConfigSelection(default=10, choices=[(0, _("Disabled"))] + [(x, ngettext("%d Second", "%d Seconds", x) % x) for x in range(1, 61)])
+config.plugins.InfoBarTimers.entries = ConfigSelection(default=DEF_ENTRIES, choices=getNumberChoices(range(MIN_ENTRIES, DEF_ENTRIES + 1)))
+config.plugins.InfoBarTimers.refreshOverlay = ConfigSelection(default=0, choices=getNumberChoices(REFRESH_INTERVALS))
+config.plugins.InfoBarTimers.refreshShow = ConfigSelection(default=10, choices=getNumberChoices(REFRESH_INTERVALS))
 config.plugins.InfoBarTimers.showOverlayList = ConfigYesNo(default=False)
+config.plugins.InfoBarTimers.virtualShow = ConfigYesNo(default=True)
+config.plugins.InfoBarTimers.coalesceWindow = ConfigSelection(default=250, choices=getNumberChoices(COALESCE_WINDOWS))
+config.plugins.InfoBarTimers.coalesceLatency = ConfigSelection(default=2000, choices=getNumberChoices(COALESCE_LATENCIES))
+config.plugins.InfoBarTimers.profile = ConfigYesNo(default=False)
+
+lazyChoices = [  # Settings whose translated choice labels are applied by applyChoiceLabels().
+	(config.plugins.InfoBarTimers.endedOverlay, OVERLAY_QUOTAS, getEntryChoices),
+	(config.plugins.InfoBarTimers.endedShow, SHOW_QUOTAS, getEntryChoices),
+	(config.plugins.InfoBarTimers.waitingOverlay, OVERLAY_QUOTAS, getEntryChoices),
+	(config.plugins.InfoBarTimers.waitingShow, SHOW_QUOTAS, getEntryChoices),
+	(config.plugins.InfoBarTimers.disabledOverlay, OVERLAY_QUOTAS, getEntryChoices),
+	(config.plugins.InfoBarTimers.disabledShow, SHOW_QUOTAS, getEntryChoices),
+	(config.plugins.InfoBarTimers.refreshOverlay, REFRESH_INTERVALS, getIntervalChoices),
+	(config.plugins.InfoBarTimers.refreshShow, REFRESH_INTERVALS, getIntervalChoices),
+	(config.plugins.InfoBarTimers.coalesceWindow, COALESCE_WINDOWS, getWindowChoices),
+	(config.plugins.InfoBarTimers.coalesceLatency, COALESCE_LATENCIES, getLatencyChoices)
+]
+
+
+def applyChoiceLabels():
+	while lazyChoices:
+		element, values, getChoices = lazyChoices.pop(0)
+		element.setChoices(getChoices(values), default=element.default)
 
 
 class InfoBarTimersSetup(Setup):
 	def __init__(self, session):
+		applyChoiceLabels()
 		Setup.__init__(self, session=session, setup="InfoBarTimers", plugin="Extensions/InfoBarTimers")
 		config.plugins.InfoBarTimers.style.addNotifier(self.updateLayout, initial_call=False, immediate_feedback=True)
 		self.updateLayout(None)
+		self["statisticsActions"] = HelpableActionMap(self, ["InfoActions"], {
+			"info": (self.keyInfo, _("Show and save the timer list refresh statistics"))
+		}, prio=0, description=_("InfoBarTimers Setup Actions"))
 		self.onClose.append(self.cleanUp)
 
 	def updateLayout(self, configElement):
 		entries, defEntries, minEntries, maxEntries = InfoBarTimersOverlay.instance.getEntries()
-		config.plugins.InfoBarTimers.entries.setChoices([(x, ngettext("%d Entry", "%d Entries", x) % x) for x in range(minEntries, maxEntries + 1)], default=str(defEntries))
+		config.plugins.InfoBarTimers.entries.setChoices(getEntryChoices(range(minEntries, maxEntries + 1)), default=str(defEntries))
 		# Remove next 2 lines after testing...
 		# itemHeight = InfoBarTimersOverlay.instance.getItemHeight(config.plugins.InfoBarTimers.style.value)
 		# print("[InfoBarTimers-Setup] updateLayout DEBUG: style='%s', itemHeight=%d, entries=%d, defEntries=%d, minEntries=%d, maxEntries=%d" % (config.plugins.InfoBarTimers.style.value, itemHeight, entries, defEntries, minEntries, maxEntries))
 
+	def keyInfo(self):
+		statistics = getStatistics()
+		try:
+			if not exists(CACHE_PATH):
+				makedirs(CACHE_PATH)
+			with open(STATISTICS_FILE, "w") as fd:
+				fd.write(statistics)
+				for item in (snapshotStatistics, overlayStatistics, showStatistics):
+					fd.write(item.getProfile())
+			message = _("Statistics saved to '%s'.") % STATISTICS_FILE
+		except (IOError, OSError) as err:
+			message = _("Error: Unable to save statistics to '%s'!  (%s)") % (STATISTICS_FILE, str(err))
+		self.session.open(MessageBox, "%s\n\n%s" % (statistics.rstrip(), message), MessageBox.TYPE_INFO)
+
 	def keySave(self):
 		self.saveAll()
+		InfoBarTimersOverlay.instance.dirty = True
 		if config.plugins.InfoBarTimers.extensionsShow.value:  # Update extension menu integration.
 			if pluginShow not in plugins.pluginList:
 				plugins.addPlugin(pluginShow)
@@ -388,6 +508,7 @@ class InfoBarTimersOverlay(Screen):
 	]
 
 	def __init__(self, session):
+		self.skin = getCompiledSkin("InfoBarTimersOverlay", InfoBarTimersOverlay.skin)
 		Screen.__init__(self, session)
 		InfoBarTimersOverlay.instance = self
 		if not self.getTitle():
@@ -400,10 +521,18 @@ class InfoBarTimersOverlay(Screen):
 		self.timersHeight = 0
 		self.heightPadding = 0
 		self.displayed = False
+		self.appliedStyle = False  # The style setting last applied to the List, False if none has been.
+		self.activeStyle = None
+		self.planStyle = None
+		self.fieldPlan = ALL_FIELDS
+		self.piconSize = None
+		self.listTimers = []
+		self.listHeight = None
+		self.entries = DEF_ENTRIES
+		self.version = None
+		self.dirty = True
 		self.onLayoutFinish.append(self.layoutFinish)
-		self.refreshTimer = eTimer()
-		self.refreshTimer.callback.append(self.refreshTimerList)
-		self.session.nav.RecordTimer.on_state_change.append(self.refreshTimerList)
+		timerSnapshots.addConsumer(self, self.session.nav.RecordTimer)
 		self.onClose.append(self.cleanUp)
 
 	def layoutFinish(self):
@@ -421,62 +550,57 @@ class InfoBarTimersOverlay(Screen):
 				config.plugins.InfoBarTimers.style.setChoices([(x, "%s%s" % (x[:1].upper(), x[1:])) for x in styles], default="default")
 		config.plugins.InfoBarTimers.style.value = config.plugins.InfoBarTimers.style.saved_value
 		self["timers"].downstream_elements[0].downstream_elements[0].instance.setSelectionEnable(0)
+		self.appliedStyle = False
+		self.planStyle = None
 		# Remove next line after testing...
 		print("[InfoBarTimers-Overlay] layoutFinish DEBUG: Screen style='%s', styles='%s', overlayWidth=%d, timersWidth=%d, timersHeight=%d, yOffset=%d, yPadding=%d" % (config.plugins.InfoBarTimers.style.value, str(styles), self.overlayWidth, self.timersWidth, self.timersHeight, yOffset, yPadding))
 
-	def refreshTimerList(self, entry=None):
-		self.refreshTimer.stop()
-		if config.plugins.InfoBarTimers.enabled.value:
-			default = overlayPositions.get(DESKTOP_SIZE[1], [50, 140])
-			left, top = config.plugins.InfoBarTimers.position.value
-			if left >= DESKTOP_SIZE[0]:
-				left = default[0]
-			if top >= DESKTOP_SIZE[1]:
-				top = default[1]
-			self.instance.move(ePoint(left, top))
-			# self.instance.setZPosition(config.plugins.InfoBarTimers.zPosition.value)
-			entries, defEntries, minEntries, maxEntries = self.getEntries()
-			ended = config.plugins.InfoBarTimers.endedOverlay.value
-			waiting = config.plugins.InfoBarTimers.waitingOverlay.value
-			disabled = config.plugins.InfoBarTimers.disabledOverlay.value
-			order = config.plugins.InfoBarTimers.orderOverlay.value
-			reverse = config.plugins.InfoBarTimers.sortOverlay.value
-			timers = updateTimerList(self.session.nav.RecordTimer, ended=ended, waiting=waiting, disabled=disabled, order=order, reverse=reverse)
-			limit = len(timers)
-			if limit > entries:
-				diff = limit - entries
-				while diff:
-					if disabled:
-						disabled -= 1
-						diff -= 1
-						if diff == 0:
-							break
-					if ended:
-						ended -= 1
-						diff -= 1
-						if diff == 0:
-							break
-					if waiting:
-						waiting -= 1
-						diff -= 1
-						if diff == 0:
-							break
-					if disabled + ended + waiting == 0:
-						print("[InfoBarTimers] Error: Timer list is too long to be fully displayed! (List=%d, Entries=%d)" % (limit, entries))
-						break
-				timers = updateTimerList(self.session.nav.RecordTimer, ended=ended, waiting=waiting, disabled=disabled, order=order, reverse=reverse)
-				limit = len(timers)
-				if limit > entries:
-					limit = entries
-			itemHeight = self.getItemHeight(self.getActiveStyle())
-			height = limit * itemHeight
+	# The overlay is a consumer of the shared timer snapshots while it is
+	# displayed.  Its layout is only recalculated when the settings have been
+	# saved or the number of listed timers changes.
+	#
+	def isSnapshotActive(self):
+		return self.displayed and refreshPlan.enabled
+
+	def getSnapshotRequirements(self):
+		style = self.getActiveStyle()
+		if style != self.planStyle:
+			self.planStyle = style
+			self.fieldPlan, self.piconSize = getFieldPlan(getTemplateEntries(self["timers"], style))
+		return refreshPlan.overlayQuotas + (self.fieldPlan, self.piconSize, refreshPlan.overlayRefresh)
+
+	def snapshotChanged(self, snapshot):
+		if snapshot.version == self.version:
+			return
+		self.version = snapshot.version
+		overlayStatistics.begin()
+		previous = self.listTimers
+		if self.dirty:
+			self.entries = self.getEntries()[0]
+		ended, waiting, disabled = refreshPlan.overlayQuotas
+		order, reverse = refreshPlan.overlayOrder
+		self.listTimers = orderTimers(trimTimers(snapshot.getTimers(ended=ended, waiting=waiting, disabled=disabled), self.entries), order=order, reverse=reverse)
+		overlayStatistics.mark("selection")
+		if self.dirty or len(self.listTimers) != len(previous):
+			self.dirty = False
+			self.updateLayout()
+			overlayStatistics.mark("layout")
+		rows = snapshot.getRows(self.listTimers, len(self.listTimers))
+		updateTimerRows(self["timers"], previous, self.listTimers, rows)
+		overlayStatistics.mark("update")
+		overlayStatistics.end(len(rows))
+
+	def updateLayout(self):
+		self.instance.move(ePoint(*refreshPlan.overlayPosition))
+		# self.instance.setZPosition(config.plugins.InfoBarTimers.zPosition.value)
+		itemHeight = self.getItemHeight(self.getActiveStyle())
+		height = min(len(self.listTimers), self.entries) * itemHeight
+		if height != self.listHeight:
+			self.listHeight = height
 			self.instance.resize(eSize(self.overlayWidth, height + self.heightPadding))
 			self["timers"].downstream_elements[0].downstream_elements[0].instance.resize(eSize(self.timersWidth, height))
-			# Remove next line after testing...
-			# print("[InfoBarTimers-Overlay] refreshTimerList DEBUG: Screen pos=(%d, %d), size=(%d, %d) - Timers size=(%d, %d), itemHeight=%d - Entries=%d, defEntries=%d, minEntries=%d, maxEntries=%d" % (left, top, self.overlayWidth, height + self.heightPadding, self.timersWidth, height, itemHeight, limit, defEntries, minEntries, maxEntries))
-			self["timers"].updateList(formatTimerList(timers, self["icons"]))
-			if self.displayed and config.plugins.InfoBarTimers.refreshOverlay.value:
-				self.refreshTimer.startLongTimer(config.plugins.InfoBarTimers.refreshOverlay.value)
+		# Remove next line after testing...
+		# print("[InfoBarTimers-Overlay] updateLayout DEBUG: Screen pos=(%d, %d), size=(%d, %d) - Timers size=(%d, %d), itemHeight=%d - Entries=%d" % (left, top, self.overlayWidth, height + self.heightPadding, self.timersWidth, height, itemHeight, self.entries))
 
 	def getEntries(self):
 		entries = int(config.plugins.InfoBarTimers.entries.value)
@@ -505,12 +629,13 @@ class InfoBarTimersOverlay(Screen):
 			print("[InfoBarTimers] Error: No itemHeight found!  Assuming a default of %d." % itemHeight)
 		return itemHeight
 
-	def getActiveStyle(self):
-		savedStyle = config.plugins.InfoBarTimers.style.value
-		if savedStyle:
-			self["timers"].setStyle(savedStyle)
-		style = self["timers"].getStyle()
-		return style
+	def getActiveStyle(self):  # The style is only applied to the List again when the setting changes.
+		if refreshPlan.style != self.appliedStyle:
+			self.appliedStyle = refreshPlan.style
+			if self.appliedStyle:
+				self["timers"].setStyle(self.appliedStyle)
+			self.activeStyle = self["timers"].getStyle()
+		return self.activeStyle
 
 	def hookInfoBar(self, reason, instanceInfoBar):
 		if reason:
@@ -521,17 +646,15 @@ class InfoBarTimersOverlay(Screen):
 	def processDisplay(self, state):
 		self.displayed = state
 		if state:
-			self.refreshTimerList()
+			timerSnapshots.refresh()
 			if self["timers"].list:
 				self.show()
 		else:
-			self.refreshTimer.stop()
 			self.hide()
 
 	def cleanUp(self):
-		self.refreshTimer.stop()
+		timerSnapshots.removeConsumer(self)
 		self.onLayoutFinish.remove(self.layoutFinish)
-		self.session.nav.RecordTimer.on_state_change.remove(self.refreshTimerList)
 		self.onClose.remove(self.cleanUp)
 		InfoBarTimersOverlay.instance = None
 
@@ -591,6 +714,7 @@ class InfoBarTimersShow(Screen, HelpableScreen):
 	]
 
 	def __init__(self, session):
+		self.skin = getCompiledSkin("InfoBarTimersShow", InfoBarTimersShow.skinTemplate)
 		Screen.__init__(self, session)
 		HelpableScreen.__init__(self)
 		self.session = session
@@ -603,292 +727,1522 @@ class InfoBarTimersShow(Screen, HelpableScreen):
 		self["icons"] = MultiPixmap()
 		self["icons"].hide()
 		self["timers"] = List()
+		self["timers"].onSelectionChanged.append(self.selectionChanged)
+		self.piconSize = None
+		self.fieldPlan = ALL_FIELDS
+		self.listTimers = []
+		self.version = None
+		self.snapshot = None
+		self.pageSize = DEF_ENTRIES
+		self.positions = {}
+		self.materialized = {}
 		self.onLayoutFinish.append(self.layoutFinish)
-		self.refreshTimer = eTimer()
-		self.refreshTimer.callback.append(self.refreshTimerList)
-		self.session.nav.RecordTimer.on_state_change.append(self.refreshTimerList)
+		timerIndex.sync(self.session.nav.RecordTimer, force=True)
 
 	def layoutFinish(self):
-		self.refreshTimerList()
+		self.fieldPlan, self.piconSize = getFieldPlan(getTemplateEntries(self["timers"], self["timers"].getStyle()))
+		itemHeight = self["timers"].downstream_elements[0].template.get("itemHeight", None)
+		if itemHeight and type(itemHeight) is int:  # The rows of the first page are formatted before the list is shown.
+			self.pageSize = self["timers"].downstream_elements[0].downstream_elements[0].instance.size().height() // itemHeight + 1
+		timerSnapshots.addConsumer(self, self.session.nav.RecordTimer)
+		timerSnapshots.refresh()
 
-	def refreshTimerList(self, entry=None):
-		self.refreshTimer.stop()
-		if config.plugins.InfoBarTimers.showOverlayList.value:
-			ended = config.plugins.InfoBarTimers.endedOverlay.value
-			waiting = config.plugins.InfoBarTimers.waitingOverlay.value
-			disabled = config.plugins.InfoBarTimers.disabledOverlay.value
+	def isSnapshotActive(self):
+		return True
+
+	def getSnapshotRequirements(self):
+		return refreshPlan.showQuotas + (self.fieldPlan, self.piconSize, refreshPlan.showRefresh)
+
+	def snapshotChanged(self, snapshot):
+		if snapshot.version == self.version:
+			return
+		self.version = snapshot.version
+		showStatistics.begin()
+		ended, waiting, disabled = refreshPlan.showQuotas
+		order, reverse = refreshPlan.showOrder
+		timers = orderTimers(snapshot.getTimers(ended=ended, waiting=waiting, disabled=disabled), order=order, reverse=reverse)
+		showStatistics.mark("selection")
+		virtual = refreshPlan.virtualShow
+		if virtual:
+			first, last = self.getWindow(len(timers))
+			snapshot.completeTimers(timers[first:last])
+			rows = snapshot.getRows(timers)
 		else:
-			ended = config.plugins.InfoBarTimers.endedShow.value
-			waiting = config.plugins.InfoBarTimers.waitingShow.value
-			disabled = config.plugins.InfoBarTimers.disabledShow.value
-		order = config.plugins.InfoBarTimers.orderShow.value
-		reverse = config.plugins.InfoBarTimers.sortShow.value
-		self["timers"].updateList(formatTimerList(updateTimerList(self.session.nav.RecordTimer, ended=ended, waiting=waiting, disabled=disabled, order=order, reverse=reverse), self["icons"]))
-		if config.plugins.InfoBarTimers.refreshShow.value:
-			self.refreshTimer.startLongTimer(config.plugins.InfoBarTimers.refreshShow.value)
+			rows = snapshot.getRows(timers, self.pageSize)
+		updateTimerRows(self["timers"], self.listTimers, timers, rows)
+		showStatistics.mark("update")
+		showStatistics.end(len(rows))
+		self.listTimers = timers
+		self.snapshot = snapshot
+		if virtual:
+			self.positions = dict([(id(x), index) for index, x in enumerate(timers)])
+			self.materialized = dict([(id(x), x) for x, row in zip(timers, rows) if row is not PLACEHOLDER_ROW])
+			self.releaseRows()
+
+	# A virtual list only has the rows of the visible page and the prefetched
+	# pages either side formatted.  The other rows are the shared
+	# PLACEHOLDER_ROW.  As the selection moves the rows coming into the window
+	# are formatted and the rows that have moved more than VIRTUAL_EVICT pages
+	# away are released so the memory and formatting time used don't depend on
+	# the number of timers listed.
+	#
+	def selectionChanged(self):
+		if self.snapshot is None or not refreshPlan.virtualShow:
+			return
+		timers = self.listTimers
+		first, last = self.getWindow(len(timers))
+		window = timers[first:last]
+		self.snapshot.completeTimers(window)
+		current = self["timers"].list
+		for index, row in enumerate(self.snapshot.getRows(window), first):
+			if row is not current[index]:
+				self["timers"].modifyEntry(index, row)
+				self.materialized[id(timers[index])] = timers[index]
+		self.releaseRows()
+
+	def getWindow(self, count):
+		index = self["timers"].getIndex() or 0
+		reach = self.pageSize * (VIRTUAL_PREFETCH + 1)
+		return max(index - reach, 0), min(index + reach, count)
+
+	def releaseRows(self):
+		index = self["timers"].getIndex() or 0
+		distance = self.pageSize * VIRTUAL_EVICT
+		released = [x for x in self.materialized.values() if abs(self.positions[id(x)] - index) > distance]
+		if released:
+			self.snapshot.evictTimers(released)
+			for timer in released:
+				del self.materialized[id(timer)]
+				self["timers"].modifyEntry(self.positions[id(timer)], PLACEHOLDER_ROW)
 
 	def keyClose(self):
-		self.refreshTimer.stop()
-		self.session.nav.RecordTimer.on_state_change.remove(self.refreshTimerList)
+		timerSnapshots.removeConsumer(self)
 		self.close()
 
 
-# If ended or waiting is None then use the config values for the number of timer entries.
+# The embedded skins are a template and a list of coordinates, for a 1280x720
+# desktop, that need to be substituted and scaled to the desktop size.  This
+# is done once, when a screen is first opened, and the result is kept in
+# memory for the rest of the session.
+#
+compiledSkins = {}
+
+
+def getCompiledSkin(name, template):
+	skin = compiledSkins.get(name)
+	if skin is None:
+		factor = DESKTOP_SIZE[1] / 720.0
+		skin = template[0] % tuple([int(x * factor) for x in template[1:]])
+		compiledSkins[name] = skin
+	return skin
+
+
+# Bursts of RecordTimer state change notifications, such as when AutoTimer
+# parses the EPG or several timers start together, are coalesced into a single
+# deferred refresh.  Each notification restarts the coalescing window but the
+# refresh is never deferred longer than the latency limit after the first
+# notification of a burst.  A window of 0 refreshes on every notification.
+#
+class StateChangeCoalescer:
+	def __init__(self, callback):
+		self.callback = callback
+		self.timer = eTimer()
+		self.timer.callback.append(self.expired)
+		self.first = None
+		self.notifications = 0
+		self.coalesced = 0
+		self.refreshes = 0
+
+	def stateChanged(self, entry=None):
+		self.notifications += 1
+		window = refreshPlan.coalesceWindow
+		if not window:
+			self.refreshes += 1
+			self.callback()
+			return
+		now = time()
+		if self.first is None:
+			self.first = now
+			delay = min(window, refreshPlan.coalesceLatency)
+		else:
+			self.coalesced += 1
+			delay = max(min(window, int((self.first - now) * 1000) + refreshPlan.coalesceLatency), 0)
+		self.timer.start(delay, True)
+
+	def expired(self):
+		self.first = None
+		self.refreshes += 1
+		self.callback()
+
+	def stop(self):
+		self.timer.stop()
+		self.first = None
+
+	def getStatistics(self):
+		return "state changes: %d notifications, %d coalesced, %d refreshes" % (self.notifications, self.coalesced, self.refreshes)
+
+
+# The overlay and the Show screen are consumers of one shared timer snapshot
+# service.  The service owns the RecordTimer state change subscription and the
+# refresh clock.  Each refresh selects the timers for the largest quotas of the
+# active consumers, formats their rows once, with the combined field plans of
+# the consumers and the largest picon box, and publishes the result as a new
+# snapshot version.  The consumers then take views of the snapshot filtered by
+# their own quotas and order settings and only re-render for a new version.
+# The rows are built with the icons of the first active consumer, all the
+# skins are expected to use the same timer icons.
+#
+# A consumer provides isSnapshotActive(), getSnapshotRequirements(), which
+# returns its (ended, waiting, disabled, fields, piconSize, refresh interval)
+# requirements, and snapshotChanged(snapshot).
+#
+class TimerSnapshotService:
+	def __init__(self):
+		self.recordTimer = None
+		self.consumers = []
+		self.version = 0
+		self.snapshot = None
+		self.rowCache = None
+		self.deferred = {}
+		self.deferredContext = None
+		self.refreshTimer = eTimer()
+		self.refreshTimer.callback.append(self.refresh)
+		self.stateChanges = StateChangeCoalescer(self.refresh)
+
+	def addConsumer(self, consumer, recordTimer):
+		if recordTimer is not self.recordTimer:
+			self.detach()
+			self.recordTimer = recordTimer
+			recordTimer.on_state_change.append(self.stateChanged)
+		if consumer not in self.consumers:
+			self.consumers.append(consumer)
+
+	def removeConsumer(self, consumer):
+		if consumer in self.consumers:
+			self.consumers.remove(consumer)
+		if not self.consumers:
+			self.detach()
+
+	def detach(self):
+		self.refreshTimer.stop()
+		self.stateChanges.stop()
+		backgroundFormatter.cancel()
+		self.deferred = {}
+		if self.recordTimer is not None and self.stateChanged in self.recordTimer.on_state_change:
+			self.recordTimer.on_state_change.remove(self.stateChanged)
+		self.recordTimer = None
+		self.snapshot = None
+		self.rowCache = None
+
+	def getActiveConsumers(self):
+		return [x for x in self.consumers if x.isSnapshotActive()]
+
+	def stateChanged(self, entry):  # While no consumer is active the next refresh selects the timers afresh anyway.
+		if self.getActiveConsumers():
+			self.stateChanges.stateChanged(entry)
+
+	def refresh(self, entry=None):  # A refresh also covers any state changes still waiting to be coalesced.
+		self.refreshTimer.stop()
+		self.stateChanges.stop()
+		consumers = self.getActiveConsumers()
+		if not consumers or self.recordTimer is None:
+			return
+		requirements = [x.getSnapshotRequirements() for x in consumers]
+		ended = getLargestQuota([x[0] for x in requirements])
+		waiting = getLargestQuota([x[1] for x in requirements])
+		disabled = getLargestQuota([x[2] for x in requirements])
+		fields = frozenset().union(*[x[3] for x in requirements])
+		piconSizes = [x[4] for x in requirements if x[4]]
+		piconSize = max(piconSizes, key=lambda x: x[0] * x[1]) if piconSizes else None
+		if self.rowCache is None:
+			self.rowCache = TimerRowCache()
+		snapshotStatistics.begin()
+		timers = selectTimers(self.recordTimer, ended=ended, waiting=waiting, disabled=disabled)
+		listed = timers["a"] + timers["d"] + timers["e"] + timers["w"]
+		snapshotStatistics.mark("selection")
+		picons = getPicons(listed, piconSize, fields)
+		snapshotStatistics.mark("picons")
+		icons = consumers[0]["icons"]
+		deferred = []
+		virtual = refreshPlan.virtualShow  # Rows are only formatted when a consumer asks for them.
+		rows = formatTimerList(listed, icons, piconSize, self.rowCache, fields, picons, deferred, 0 if virtual else BACKGROUND_ROWS)
+		snapshotStatistics.mark("formatting")
+		self.version += 1
+		self.snapshot = TimerSnapshot(self, self.version, timers, dict(zip([id(x) for x in listed], rows)))
+		snapshotStatistics.end(len(rows))
+		self.deferred = dict([(id(x[0]), x) for x in deferred])
+		self.deferredContext = (icons, piconSize, fields)
+		if deferred and not virtual:
+			backgroundFormatter.submit(deferred, fields, refreshPlan.dateFmt, refreshPlan.timeFmt, self.backgroundFormatted)
+		else:
+			backgroundFormatter.cancel()
+		for consumer in consumers:
+			consumer.snapshotChanged(self.snapshot)
+		intervals = [x[5] for x in requirements if x[5]]
+		if intervals:
+			self.refreshTimer.start(getRefreshDelay(listed, fields, min(intervals)), True)
+
+	def backgroundFormatted(self, items):  # Publish the rows formatted in the background as a new version.
+		items = [x for x in items if self.deferred.pop(id(x[0]), None) is not None]
+		consumers = self.getActiveConsumers()
+		if items and self.snapshot and consumers:
+			snapshotStatistics.begin()
+			self.completeRows(items)
+			snapshotStatistics.mark("formatting")
+			snapshotStatistics.end(len(items))
+			self.version += 1
+			self.snapshot.version = self.version
+			for consumer in consumers:
+				consumer.snapshotChanged(self.snapshot)
+
+	def completeTimers(self, timers):  # Build the rows of any of the timers still waiting for the background now.
+		items = [self.deferred.pop(id(x)) + (None,) for x in timers if id(x) in self.deferred]
+		if items:
+			self.completeRows(items)
+
+	def evictTimers(self, timers):  # Release the rows of the timers until they are needed again.
+		for timer in timers:
+			entry = self.rowCache.rows.pop(id(timer), None)
+			if entry:
+				self.deferred[id(timer)] = (timer, entry.revision, entry.revision[6])  # The picon is part of the revision.
+				self.snapshot.rows[id(timer)] = PLACEHOLDER_ROW
+
+	def completeRows(self, items):
+		icons, piconSize, fields = self.deferredContext
+		dateFmt = refreshPlan.dateFmt
+		timeFmt = refreshPlan.timeFmt
+		cache = TimerRowCache()
+		cache.context = self.rowCache.context
+		for timer, revision, picon, text in items:
+			if text is None:
+				text = formatStaticText(timer, fields, dateFmt, timeFmt)
+			cache.rows[id(timer)] = self.rowCache.rows[id(timer)] = TimerRow(timer, revision, completeStatic(text, timer, icons, picon, fields))
+		timers = [x[0] for x in items]
+		for timer, row in zip(timers, formatTimerList(timers, icons, piconSize, cache, fields, [x[2] for x in items])):
+			self.snapshot.rows[id(timer)] = row
+
+
+# The views returned by a snapshot are copies.  The rows of timers formatted
+# in the background are filled in as they become available, each time with a
+# new version.  The rows of a virtual Show list are formatted, and released,
+# by the screen as the selection moves.
+#
+class TimerSnapshot:
+	def __init__(self, service, version, timers, rows):
+		self.service = service
+		self.version = version
+		self.timers = timers
+		self.rows = rows
+
+	def getTimers(self, ended, waiting, disabled):  # The quotas must not be larger than those the snapshot was built for.
+		return {"a": self.timers["a"][:], "d": getQuotaTimers(self.timers["d"], disabled), "e": getQuotaTimers(self.timers["e"], ended), "w": getQuotaTimers(self.timers["w"], waiting)}
+
+	def getRows(self, timers, first=0):  # The rows of the first "first" timers are always fully formatted.
+		if first:
+			self.service.completeTimers(timers[:first])
+		return [self.rows[id(x)] for x in timers]
+
+	def completeTimers(self, timers):
+		self.service.completeTimers(timers)
+
+	def evictTimers(self, timers):
+		self.service.evictTimers(timers)
+
+
+def getQuotaTimers(timers, quota):
+	return timers[:] if quota < 0 else timers[:quota]
+
+
+def getLargestQuota(quotas):
+	return -1 if -1 in quotas else max(quotas)
+
+
+timerSnapshots = TimerSnapshotService()
+
+
+# Each timer list refresh is timed in phases (timer selection, picon file
+# lookup, pixmap loads, row formatting, overlay layout and list update) by
+# calling mark() at the end of each phase.  The time since the previous mark
+# is charged to the phase so a phase can be marked more than once per refresh.
+# Pixmaps are loaded while rows are formatted or completed, so the load time
+# measured by the pixmap cache since the previous mark is charged to the
+# "pixmaps" phase instead of the phase that was marked.  The slowest refreshes
+# are kept with their phase breakdown.  While the profile setting is enabled
+# the refreshes are also run under cProfile.  The profile accumulates across
+# all the profiled refreshes of the session.
+#
+class RefreshStatistics:
+	def __init__(self, name, samples=SLOW_REFRESH_SAMPLES):
+		self.name = name
+		self.samples = samples
+		self.refreshes = 0
+		self.rows = 0
+		self.duration = 0.0
+		self.totals = dict.fromkeys(REFRESH_PHASES, 0.0)
+		self.counts = dict.fromkeys(REFRESH_PHASES, 0)
+		self.slowest = []  # A heap of (duration, time, rows, phases) tuples.
+		self.phases = None
+		self.start = 0.0
+		self.last = 0.0
+		self.loads = 0.0
+		self.profiler = None
+		self.profiling = False
+
+	def begin(self):
+		if refreshPlan.profile:
+			if self.profiler is None:
+				self.profiler = Profile()
+			self.profiler.enable()
+			self.profiling = True
+		self.phases = {}
+		self.loads = pixmapCache.loadTime
+		self.start = self.last = perf_counter()
+
+	def mark(self, phase):
+		now = perf_counter()
+		loads = pixmapCache.loadTime - self.loads
+		self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last - loads
+		if loads:
+			self.phases["pixmaps"] = self.phases.get("pixmaps", 0.0) + loads
+		self.last = now
+		self.loads = pixmapCache.loadTime
+
+	def end(self, rows):
+		duration = perf_counter() - self.start
+		if self.profiling:
+			self.profiler.disable()
+			self.profiling = False
+		self.refreshes += 1
+		self.rows += rows
+		self.duration += duration
+		for phase, value in self.phases.items():
+			self.totals[phase] += value
+			self.counts[phase] += 1
+		sample = (duration, time(), rows, self.phases)
+		if len(self.slowest) < self.samples:
+			heappush(self.slowest, sample)
+		elif duration > self.slowest[0][0]:
+			heappushpop(self.slowest, sample)
+		self.phases = None
+
+	def getStatistics(self):
+		if not self.refreshes:
+			return "%s refreshes: None\n" % self.name
+		lines = ["%s refreshes: %d, %d rows, average %.2f ms, total %.1f ms" % (self.name, self.refreshes, self.rows, self.duration * 1000.0 / self.refreshes, self.duration * 1000.0)]
+		for phase in REFRESH_PHASES:
+			if self.counts[phase]:
+				lines.append("  %-10s %6d calls, average %.2f ms, total %.1f ms" % (phase, self.counts[phase], self.totals[phase] * 1000.0 / self.counts[phase], self.totals[phase] * 1000.0))
+		for duration, when, rows, phases in sorted(self.slowest, reverse=True):
+			lines.append("  Slow: %s %.2f ms, %d rows (%s)" % (strftime("%Y-%m-%d %H:%M:%S", localtime(when)), duration * 1000.0, rows, ", ".join(["%s %.2f" % (x, phases[x] * 1000.0) for x in REFRESH_PHASES if x in phases])))
+		return "%s\n" % "\n".join(lines)
+
+	def getProfile(self):
+		if self.profiler is None or self.profiling:
+			return ""
+		from pstats import Stats  # Only needed for a profile so not imported with the plugin.
+		stream = StringIO()
+		try:
+			Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_LINES)
+		except TypeError:  # The profile is empty.
+			return ""
+		return "\n%s refresh profile:\n%s" % (self.name, stream.getvalue())
+
+
+snapshotStatistics = RefreshStatistics("Snapshot")
+overlayStatistics = RefreshStatistics("Overlay")
+showStatistics = RefreshStatistics("Show")
+
+
+def getStatistics():
+	lines = [snapshotStatistics.getStatistics(), overlayStatistics.getStatistics(), showStatistics.getStatistics(), "%s\n" % pixmapCache.getStatistics()]
+	lines.append("Snapshots: %d versions, %s\n" % (timerSnapshots.version, timerSnapshots.stateChanges.getStatistics()))
+	lines.append("Signal sampler: %d tuner queries\n" % signalSampler.queries)
+	lines.append("Timer index: %d timers, %d rebuilds\n" % (len(timerIndex.members), timerIndex.rebuilds))
+	return "".join(lines)
+
+
 # If ended or waiting is -1 then use all available timer entries of this type.
 # If ended or waiting is 0 then don't use this type of timer entry.
 # If ended or waiting is > 0 then use up to this number of this type of timer entry.
 #
-def updateTimerList(recordTimer, ended, waiting, disabled, order, reverse):
-	timersDisabled = []
-	timersEnded = []
-	for item in reversed(recordTimer.processed_timers):
-		if item.disabled:
-			if disabled:
-				timersDisabled.append(item)
-				disabled -= 1
-		else:
-			if ended:
-				timersEnded.append(item)
-				ended -= 1
-	timersActive = []
+# Return the selected timers as a dictionary of lists keyed by the category
+# letters used in the order settings.  Each list is in selection order, that
+# is most recently ended first for the disabled and ended timers, order of
+# begin time for the active timers and order of activation for the waiting
+# timers, so trimming a list from the end drops the entries that would not
+# have been selected for a smaller quota.  The disabled, ended and active
+# timers come from the TimerIndex.  The waiting timers are taken from the
+# front of the pending timer list, which RecordTimer keeps in order of
+# activation even when a timer is edited without a state change notification,
+# and the scan stops as soon as the quota is filled.
+#
+def selectTimers(recordTimer, ended, waiting, disabled):
+	timerIndex.sync(recordTimer)
+	timersDisabled = timerIndex.getTimers("d", disabled)[::-1] if disabled else []
+	timersEnded = timerIndex.getTimers("e", ended)[::-1] if ended else []
 	timersWaiting = []
-	for item in recordTimer.timer_list:
-		if item.state == item.StateWaiting:
-			if waiting:
-				timersWaiting.append(item)
-				waiting -= 1
-		else:
-			timersActive.append(item)
+	if waiting:
+		for timer in recordTimer.timer_list:
+			if timer.state == timer.StateWaiting:
+				timersWaiting.append(timer)
+				if len(timersWaiting) == waiting:
+					break
+	return {"a": timerIndex.getTimers("a", -1), "d": timersDisabled, "e": timersEnded, "w": timersWaiting}
+
+
+# Sort each category of the selected timers by begin time, in the order given
+# by the order setting.  Only the selected timers are sorted, and the active
+# timers are already in begin order.
+#
+def orderTimers(timers, order, reverse):
 	reverse = reverse == 1
-	timers = []
+	list = []
 	for item in order:
-		if item == "a":
-			timersActive.sort(key=attrgetter("begin"), reverse=reverse)
-			timers.extend(timersActive)
-		elif item == "d":
-			timersDisabled.sort(key=attrgetter("begin"), reverse=reverse)
-			timers.extend(timersDisabled)
-		elif item == "e":
-			timersEnded.sort(key=attrgetter("begin"), reverse=reverse)
-			timers.extend(timersEnded)
-		elif item == "w":
-			timersWaiting.sort(key=attrgetter("begin"), reverse=reverse)
-			timers.extend(timersWaiting)
+		if item in timers:
+			list.extend(sorted(timers[item], key=attrgetter("begin"), reverse=reverse))
+	return list
+
+
+# The active timers and the processed timers history are indexed in active,
+# disabled and ended views so that they can be selected without scanning the
+# RecordTimer lists.  The active view is in order of begin time.  The disabled
+# and ended views are in order of end time, which is the order RecordTimer
+# keeps its processed timers in, so the latest timers of a view are the most
+# recently ended.  The views are updated by bisect insertion and removal from
+# the RecordTimer state change notifications, which are subscribed ahead of
+# the notification of the snapshot service so that the index is up to date
+# when a refresh selects the timers.  Waiting timers are not indexed.
+#
+# Timers can be added, removed or edited without a notification so the index
+# is rebuilt whenever the number of indexed processed timers doesn't match the
+# processed timers list, a returned timer's category or sort key no longer
+# matches the index, or the index is older than the resync interval.  The Show
+# screen also forces a rebuild when it is opened.
+#
+class TimerIndex:
+	def __init__(self, resync=TIMER_INDEX_RESYNC):
+		self.resync = resync
+		self.recordTimer = None
+		self.members = {}  # Indexed timers keyed by id() giving (category, sort key).
+		self.keys = {}
+		self.timers = {}
+		self.processed = 0
+		self.built = 0
+		self.rebuilds = 0
+
+	def attach(self, recordTimer):
+		if self.recordTimer is not None and self.stateChanged in self.recordTimer.on_state_change:
+			self.recordTimer.on_state_change.remove(self.stateChanged)
+		self.recordTimer = recordTimer
+		recordTimer.on_state_change.insert(0, self.stateChanged)
+		self.rebuild()
+
+	def sync(self, recordTimer, force=False):
+		if recordTimer is not self.recordTimer:
+			self.attach(recordTimer)
+		elif force or self.processed != len(recordTimer.processed_timers) or time() - self.built >= self.resync:
+			self.rebuild()
+
+	def rebuild(self):
+		self.members = {}
+		self.keys = {"a": [], "d": [], "e": []}
+		self.timers = {"a": [], "d": [], "e": []}
+		for timers, processed in ((self.recordTimer.timer_list, False), (self.recordTimer.processed_timers, True)):
+			for timer in sorted([x for x in timers if getCategory(x, processed) != "w"], key=lambda x: getSortKey(x, processed)):
+				category = getCategory(timer, processed)
+				key = getSortKey(timer, processed)
+				self.members[id(timer)] = (category, key)
+				self.keys[category].append(key)
+				self.timers[category].append(timer)
+		self.processed = len(self.recordTimer.processed_timers)
+		self.built = time()
+		self.rebuilds += 1
+
+	def stateChanged(self, timer):
+		self.remove(timer)
+		if timer.state == timer.StateEnded:  # RecordTimer only keeps ended timers in its processed timers history.
+			self.add(timer, True)
+		elif getCategory(timer, False) == "a":
+			self.add(timer, False)
+
+	def add(self, timer, processed):
+		category = getCategory(timer, processed)
+		key = getSortKey(timer, processed)
+		keys = self.keys[category]
+		index = bisect_right(keys, key)
+		keys.insert(index, key)
+		self.timers[category].insert(index, timer)
+		self.members[id(timer)] = (category, key)
+		if processed:
+			self.processed += 1
+
+	def remove(self, timer):
+		member = self.members.pop(id(timer), None)
+		if member:
+			category, key = member
+			keys = self.keys[category]
+			timers = self.timers[category]
+			for index in range(bisect_left(keys, key), bisect_right(keys, key)):
+				if timers[index] is timer:
+					del timers[index]
+					del keys[index]
+					break
+			if category != "a":
+				self.processed -= 1
+
+	# Return the latest "count" timers of the active ("a"), disabled ("d") or
+	# ended ("e") view in view order.  A count of -1 returns all the timers of
+	# the view.
+	#
+	def getTimers(self, category, count):
+		for attempt in (0, 1):
+			timers = self.timers[category]
+			view = timers[len(timers) - count:] if 0 <= count < len(timers) else timers[:]
+			processed = category != "a"
+			if all([self.members.get(id(x)) == (category, getSortKey(x, processed)) and getCategory(x, processed) == category for x in view]):
+				break
+			self.rebuild()
+		return view
+
+
+# Return the category of a timer from the processed timers history or, if
+# "processed" is False, from the pending timer list.
+#
+def getCategory(timer, processed):
+	if processed:
+		return "d" if timer.disabled else "e"
+	return "a" if timer.state in (timer.StatePrepared, timer.StateRunning) else "w"
+
+
+# The active view is sorted by begin time, with timers that begin together in
+# the order RecordTimer activates them, and the processed views by end time.
+#
+def getSortKey(timer, processed):
+	return timer.end if processed else (timer.begin, timer.end)
+
+
+timerIndex = TimerIndex()
+
+
+# Trim the selected timers, in place, to fit "entries" rows and return them.
+#
+def trimTimers(timers, entries):
+	limit = sum([len(x) for x in timers.values()])
+	if limit > entries:
+		(disabled, ended, waiting), diff = trimQuotas((len(timers["d"]), len(timers["e"]), len(timers["w"])), limit - entries)
+		if diff:
+			print("[InfoBarTimers] Error: Timer list is too long to be fully displayed! (List=%d, Entries=%d)" % (limit, entries))
+		del timers["d"][disabled:]
+		del timers["e"][ended:]
+		del timers["w"][waiting:]
 	return timers
 
 
-def formatTimerList(timers, icons):
-	def formatDuration(sign, value):
-		if value < 60:
-			format = ngettext("%s%d Sec", "%s%d Secs", value) % (sign, value)
+# Reduce the category counts, given in the order they are to be trimmed, so
+# that "excess" entries are removed.  Entries are taken from each category in
+# turn, one at a time, skipping empty categories, which is how the overlay
+# has always trimmed its list.  Whole rounds are removed at once so this only
+# loops once per category.  Return the new counts and the number of entries
+# that could not be removed.
+#
+def trimQuotas(counts, excess):
+	counts = list(counts)
+	while excess > 0:
+		live = [index for index, count in enumerate(counts) if count]
+		if not live:
+			break
+		rounds = min(min([counts[index] for index in live]), excess // len(live))
+		if rounds:
+			for index in live:
+				counts[index] -= rounds
+			excess -= rounds * len(live)
 		else:
-			format = int(value // 60)
-			format = ngettext("%s%d Min", "%s%d Mins", format) % (sign, format)
-		return format
-
-	def formatTime(value):
-		if config.plugins.InfoBarTimers.format.value == 1:
-			format = None if value < 0 else "%d:%02d:%02d" % (value / 3600, value / 60 % 60, value % 60)
-		elif config.plugins.InfoBarTimers.format.value == 2:
-			format = None if value < 0 else "%d:%02d" % (value / 60, value % 60)
-		elif config.plugins.InfoBarTimers.format.value == 3:
-			format = None if value < 0 else "%d:%02d" % (value / 3600, value / 60 % 60)
+			for index in live[:excess]:
+				counts[index] -= 1
+			excess = 0
+	return counts, excess
+
+
+# Decoded images are kept in a least recently used cache keyed by the file name
+# so that the picons and the IceTV icon are not decoded from flash on every
+# refresh.  The file modification time is rechecked at most every "check"
+# seconds and a changed file is reloaded.  Files that do not exist are cached
+# as None so that they are not probed on every row.  The time spent in load()
+# is accumulated for the refresh statistics.
+#
+class PixmapCache:
+	def __init__(self, size=PIXMAP_CACHE_SIZE, check=PIXMAP_CACHE_CHECK):
+		self.size = size
+		self.check = check
+		self.cache = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.loadTime = 0.0
+
+	def load(self, path):
+		start = perf_counter()
+		pixmap = self.lookup(path)
+		self.loadTime += perf_counter() - start
+		return pixmap
+
+	def lookup(self, path):
+		now = time()
+		entry = self.cache.get(path)
+		if entry:
+			pixmap, mtime, checked = entry
+			if now - checked < self.check:
+				self.cache.move_to_end(path)
+				self.hits += 1
+				return pixmap
+			if self.getModTime(path) == mtime:
+				self.cache[path] = (pixmap, mtime, now)
+				self.cache.move_to_end(path)
+				self.hits += 1
+				return pixmap
+		self.misses += 1
+		mtime = self.getModTime(path)
+		pixmap = None if mtime is None else LoadPixmap(path)
+		self.cache[path] = (pixmap, mtime, now)
+		self.cache.move_to_end(path)
+		while len(self.cache) > self.size:
+			self.cache.popitem(last=False)
+		return pixmap
+
+	def getModTime(self, path):
+		try:
+			return stat(path).st_mtime
+		except OSError:
+			return None
+
+	def clear(self):
+		self.cache.clear()
+
+	def getStatistics(self):
+		total = self.hits + self.misses
+		return "Pixmap cache: %d/%d entries, %d hits, %d misses (%d%% hit rate)" % (len(self.cache), self.size, self.hits, self.misses, self.hits * 100 // total if total else 0)
+
+
+pixmapCache = PixmapCache()
+
+
+# The picon directories are scanned once into a picon name to file name index
+# and each service reference is resolved against that index only once.  The
+# directories' modification times are rechecked at most every "check" seconds
+# and the index is rebuilt only when a directory, or the list of directories,
+# changes.  Service references that can't be matched from the index (such as
+# channel name picons) fall back to the image's own getPiconName() lookup.
+# Picon directories on network mounts are skipped, as the image does, so the
+# GUI thread is never blocked on a slow or unavailable mount.
+#
+class PiconIndex:
+	def __init__(self, check=PICON_INDEX_CHECK):
+		self.check = check
+		self.checked = 0
+		self.directories = None
+		self.picons = {}
+		self.services = {}
+		self.generation = 0
+
+	def getPicon(self, serviceRef):
+		now = time()
+		if now - self.checked >= self.check:
+			self.checked = now
+			directories = self.getDirectories()
+			if directories != self.directories:
+				self.build(directories)
+		picon = self.services.get(serviceRef)
+		if picon is None:
+			picon = self.resolve(serviceRef)
+			self.services[serviceRef] = picon
+		return picon
+
+	def getDirectories(self):
+		directories = []
+		for path in getattr(Picon, "searchPaths", []):
+			if path.startswith(PICON_SKIP_PATHS):
+				continue
+			try:
+				directories.append((path, stat(path).st_mtime))
+			except OSError:
+				pass
+		return directories
+
+	def build(self, directories):
+		picons = {}
+		for path, mtime in directories:
+			try:
+				files = listdir(path)
+			except OSError:
+				continue
+			for file in files:
+				if file.endswith(".png"):
+					picons.setdefault(file[:-4], join(path, file))
+		self.directories = directories
+		self.picons = picons
+		self.services = {}
+		self.generation += 1
+		print("[InfoBarTimers] Picon index built with %d picons from %d directories." % (len(picons), len(directories)))
+
+	def resolve(self, serviceRef):  # Try the same service reference variations as getPiconName().
+		fields = serviceRef.split(":", 10)[:10]
+		if len(fields) == 10:
+			picon = self.picons.get("_".join(fields))
+			if not picon and not fields[6].endswith("0000"):
+				fields[6] = "%s0000" % fields[6][:-4]  # Remove the "sub-network" from the namespace.
+				picon = self.picons.get("_".join(fields))
+			if not picon and fields[0] != "1":
+				fields[0] = "1"  # Fall back to 1 for IPTV streams.
+				picon = self.picons.get("_".join(fields))
+			if not picon and fields[2] != "2":
+				fields[2] = "1"  # Fall back to 1 for TV services with non-standard service types.
+				picon = self.picons.get("_".join(fields))
+			if picon:
+				return picon
+		return getPiconName(serviceRef) or ""
+
+
+piconIndex = PiconIndex()
+
+
+# All the templates draw the picon with BT_SCALE into a small box so scaled
+# copies of the picons, sized to that box, are generated in the background and
+# used in place of the original picons.  The scaled picons are stored on disk
+# by target size with the source modification time in the file name.  Until a
+# scaled picon is available, or if PIL is not installed, the original picon is
+# used.
+#
+class PiconThumbnails:
+	def __init__(self, path=join(CACHE_PATH, "picons")):
+		self.path = path
+		self.thumbnails = {}
+		self.generation = None
+		self.queue = Queue()
+		self.worker = None
+		self.image = False  # The PIL Image module, or None if PIL isn't installed.
+
+	def getThumbnail(self, picon, size):
+		if not picon or not size:
+			return picon
+		if self.image is False:
+			try:  # PIL is slow to import so it is only imported when the first picon is needed.
+				from PIL import Image
+				self.image = Image
+			except ImportError:
+				self.image = None
+		if self.image is None:
+			return picon
+		if self.generation != piconIndex.generation:
+			self.generation = piconIndex.generation
+			self.thumbnails = {}
+		key = (picon, size)
+		thumbnail = self.thumbnails.get(key, False)
+		if thumbnail is False:
+			self.thumbnails[key] = None
+			self.queue.put(key)
+			if self.worker is None:
+				self.worker = Thread(target=self.run, name="InfoBarTimers-Picons")
+				self.worker.daemon = True
+				self.worker.start()
+			return picon
+		return thumbnail or picon
+
+	def run(self):  # Any failure only affects the one picon so the worker keeps serving the queue.
+		while True:
+			picon, size = self.queue.get()
+			try:
+				self.thumbnails[(picon, size)] = self.makeThumbnail(picon, size)
+			except Exception as err:
+				print("[InfoBarTimers] Error: Unable to scale picon '%s' to %dx%d!  (%s)" % (picon, size[0], size[1], str(err)))
+				self.thumbnails[(picon, size)] = picon
+
+	def makeThumbnail(self, picon, size):
+		try:
+			path = join(self.path, "%dx%d" % size)
+			thumbnail = join(path, "%s_%d.png" % (basename(picon)[:-4], stat(picon).st_mtime))
+			if not exists(thumbnail):
+				if not exists(path):
+					makedirs(path)
+				image = self.image.open(picon).convert("RGBA").resize(size, self.image.LANCZOS)
+				image.save("%s.tmp" % thumbnail, "PNG")
+				rename("%s.tmp" % thumbnail, thumbnail)
+			return thumbnail
+		except (IOError, OSError) as err:
+			print("[InfoBarTimers] Error: Unable to scale picon '%s' to %dx%d!  (%s)" % (picon, size[0], size[1], str(err)))
+			return picon
+
+
+piconThumbnails = PiconThumbnails()
+
+
+# Return the list of template entries for the given style of a TemplatedMultiContent List.
+#
+def getTemplateEntries(source, style):
+	template = source.downstream_elements[0].template
+	if "templates" in template:
+		template = template["templates"].get(style, None)
+		return template[1] if template else []
+	return template.get("template", [])
+
+
+# Return the set of fields referenced by the template entries or None if the
+# template contains entries that are not understood.
+#
+def getTemplateFields(entries):
+	fields = set()
+	for entry in entries:
+		if entry[0] == eListboxPythonMultiContent.TYPE_TEXT:
+			field = entry[7]
+		elif entry[0] in (eListboxPythonMultiContent.TYPE_PIXMAP, eListboxPythonMultiContent.TYPE_PIXMAP_ALPHATEST, eListboxPythonMultiContent.TYPE_PIXMAP_ALPHABLEND):
+			field = entry[5]
+		elif entry[0] in (eListboxPythonMultiContent.TYPE_PROGRESS, eListboxPythonMultiContent.TYPE_PROGRESS_PIXMAP):
+			field = -entry[5] if isinstance(entry[5], int) else None  # A negative percent is a field number.
 		else:
-			format = "%d Secs" % value if value < 60 else "%d Mins" % int(value / 60)
-		return format
-
-	snrLabels = ["", _("Q"), _("Q"), _("SNR")]
-	powerLabels = ["", _("S"), _("P"), _("AGC")]
-	labelSeparators = ["", " ", ":", "=", "-", ": ", " = ", " - "]
-	signal = config.plugins.InfoBarTimers.signalIndex.value
-	if signal:
-		separator = labelSeparators[config.plugins.InfoBarTimers.separatorIndex.value]
+			return None
+		if isinstance(field, int) and field >= 0:
+			fields.add(field)
+	return fields
+
+
+# Return the field plan, the set of fields formatTimerList() needs to calculate
+# for a template, and the size of the template's picon box.  All fields are
+# calculated for templates that can't be fully understood.
+#
+def getFieldPlan(entries):
+	fields = getTemplateFields(entries)
+	fields = ALL_FIELDS if fields is None else frozenset(fields)
+	print("[InfoBarTimers] Template field plan: %s." % ", ".join([str(x) for x in sorted(fields)]))
+	return fields, getPiconSize(entries)
+
+
+# Return the size of the box the template draws the service picon (field 12) into.
+#
+def getPiconSize(entries):
+	for entry in entries:
+		if entry[0] in (eListboxPythonMultiContent.TYPE_PIXMAP, eListboxPythonMultiContent.TYPE_PIXMAP_ALPHATEST, eListboxPythonMultiContent.TYPE_PIXMAP_ALPHABLEND) and entry[5] == 12:
+			return (entry[3], entry[4])
+	return None
+
+
+# Return the delay, in milliseconds, until the next time that any of the given
+# template fields will show a different value.  Elapsed and remaining times
+# only change once a minute when displayed in minutes, and the progress only
+# changes once per percent.  Timers starting or ending also change the display.
+# Signal values can change at any time so they, and the user selected refresh
+# interval, limit the delay.  The interval is also the longest delay, as timers
+# added or edited with timeChanged() don't send a state change notification.
+# If the fields are not known then every field is assumed to be displayed.
+#
+def getRefreshDelay(timers, fields, interval):
+	def nextUp(start, unit):  # When the displayed value of (now - start) / unit next increases.
+		return start + (floor((now - start) / unit) + 1) * unit
+
+	def nextDown(end, unit):  # When the displayed value of (end - now) / unit next decreases.
+		return max(end - floor((end - now) / unit) * unit, now)
+
+	def secsMins(value):  # Unit of formatDuration() and the "Mins/Secs" format.
+		return 1 if value < 60 else 60
+
+	now = time()
+	limit = now + interval
+	fields = TIME_FIELDS | SIGNAL_FIELDS if fields is None else fields & (TIME_FIELDS | SIGNAL_FIELDS)
+	if fields:
+		format = refreshPlan.format
+		swap = refreshPlan.swap
+		for timer in timers:
+			if not (timer.begin and timer.end) or now > timer.end:
+				continue
+			if now < timer.begin:
+				limit = min(limit, timer.begin)
+				continue
+			limit = min(limit, timer.end)
+			if fields & SIGNAL_FIELDS and timer.record_service:
+				continue
+			elapsed = now - timer.begin
+			remaining = timer.end - now
+			units = []
+			for field in fields:
+				if field in (28, 33):
+					value = elapsed if field == 28 else remaining
+					units.append((field, 1 if format in (1, 2) else 60 if format == 3 else secsMins(value)))
+				elif field in (29, 34, 38):
+					if field == 38 and swap in ("2", "3"):
+						units.append((29, 60))
+						units.append((34, 60))
+					else:
+						field = 29 if field == 29 or (field == 38 and swap == "1") else 34
+						units.append((field, secsMins(elapsed if field == 29 else remaining)))
+				elif field in (30, 35):
+					units.append((field, 60))
+				elif field in (31, 32, 36, 37):
+					units.append((field, 1))
+				elif field in (39, 40):
+					duration = timer.end - timer.begin
+					limit = min(limit, timer.begin + (int(elapsed / duration * 100.0) + 1) * duration / 100.0)
+			for field, unit in units:
+				limit = min(limit, nextUp(timer.begin, unit) if field < 33 else nextDown(timer.end, unit))
+	return min(int((limit - now + REFRESH_MARGIN) * 1000), interval * 1000)
+
+
+# Push new rows to a timers List source.  When the list still holds the same
+# timers in the same order only the rows that have changed are replaced, with
+# modifyEntry(), so that the Listbox only redraws those entries.  Otherwise the
+# whole list is replaced.
+#
+def updateTimerRows(source, previous, timers, rows):
+	current = source.list
+	if len(previous) == len(timers) == len(current) and all([x is y for x, y in zip(previous, timers)]):
+		for index, row in enumerate(rows):
+			if row != current[index]:
+				source.modifyEntry(index, row)
 	else:
-		separator = ""
-	list = []
+		source.updateList(rows)
+
+
+# Each row is split into a static part, which only depends on the timer's
+# settings and state, and the dynamic tuner and elapsed / remaining time parts.
+# The static part is kept in a TimerRowCache, as a TimerRow, keyed by timer
+# identity and a revision tuple of the timer attributes it is built from.  The
+# whole cache is dropped when a setting used by the static part changes.  Only
+# the rows of the timers in the latest list are kept.
+#
+class TimerRowCache:
+	def __init__(self):
+		self.rows = {}
+		self.context = None
+
+
+# A TimerRowCache entry.  The static part of the row is not kept separately,
+# it is taken back out of the last row built, which is kept with the tuner
+# and elapsed / remaining time parts it was built with.  The rows of timers
+# whose dynamic parts haven't changed, such as all the waiting and ended
+# timers, are then reused by each refresh rather than built again.  The rows
+# themselves stay plain tuples as that is what the list content expects.
+#
+class TimerRow:
+	__slots__ = ("timer", "revision", "tuner", "elapsed", "row")
+
+	def __init__(self, timer, revision, static):
+		self.timer = timer
+		self.revision = revision
+		self.tuner = NO_TUNER
+		self.elapsed = NO_ELAPSED
+		self.row = static[0:4] + NO_TUNER + static[4:20] + NO_ELAPSED + static[20:23]
+
+	def getRow(self, tuner, elapsed):
+		if tuner != self.tuner or elapsed != self.elapsed:
+			row = self.row
+			self.row = row[0:4] + tuner + row[12:28] + elapsed + row[41:44]
+			self.tuner = tuner
+			self.elapsed = elapsed
+		return self.row
+
+
+# Building the static parts of the rows of a long timer list, such as a Show
+# screen listing every timer, can take seconds.  The text parts of those rows
+# only use Python code so they are built by a pool of worker threads and the
+# results are collected on the GUI thread, in chunks, by polling with an
+# eTimer.  The Python interpreter lock means the workers don't make the
+# formatting any faster but the GUI keeps drawing and responding while it is
+# done.  A new job abandons any unfinished job.  If a worker fails the rows
+# are returned without text and are then built on the GUI thread.
+#
+class BackgroundFormatter:
+	def __init__(self, workers=FORMAT_WORKERS, chunk=FORMAT_CHUNK):
+		self.workers = workers
+		self.chunk = chunk
+		self.jobs = Queue()
+		self.results = Queue()
+		self.threads = []
+		self.generation = 0
+		self.pending = 0
+		self.callback = None
+		self.pollTimer = None
+
+	def submit(self, items, fields, dateFmt, timeFmt, callback):
+		self.generation += 1
+		self.callback = callback
+		self.pending = 0
+		for index in range(0, len(items), self.chunk):
+			self.jobs.put((self.generation, items[index:index + self.chunk], fields, dateFmt, timeFmt))
+			self.pending += 1
+		while len(self.threads) < self.workers:
+			thread = Thread(target=self.run, name="InfoBarTimers-Format%d" % len(self.threads))
+			thread.daemon = True
+			thread.start()
+			self.threads.append(thread)
+		if self.pollTimer is None:
+			self.pollTimer = eTimer()
+			self.pollTimer.callback.append(self.poll)
+		self.pollTimer.start(FORMAT_POLL, True)
+
+	def cancel(self):
+		if self.pending:
+			self.generation += 1
+			self.pending = 0
+			self.pollTimer.stop()
+
+	def run(self):
+		while True:
+			generation, items, fields, dateFmt, timeFmt = self.jobs.get()
+			if generation != self.generation:
+				continue
+			try:
+				results = [item + (formatStaticText(item[0], fields, dateFmt, timeFmt),) for item in items]
+			except Exception as err:
+				print("[InfoBarTimers] Error: Background row formatting failed!  (%s)" % str(err))
+				results = [item + (None,) for item in items]
+			self.results.put((generation, results))
+
+	def poll(self):
+		results = []
+		while self.pending:
+			try:
+				generation, items = self.results.get_nowait()
+			except Empty:
+				break
+			if generation == self.generation:
+				self.pending -= 1
+				results.extend(items)
+		if self.pending:
+			self.pollTimer.start(FORMAT_POLL, True)
+		if results:
+			self.callback(results)
+
+
+backgroundFormatter = BackgroundFormatter()
+
+
+# Return the picon file names for the timers, or None if the field plan
+# doesn't include the picon (field 12).
+#
+def getPicons(timers, piconSize, fields):
+	if 12 not in fields:
+		return [None] * len(timers)
+	picons = []
 	for timer in timers:
+		picon = piconIndex.getPicon(timer.service_ref.ref.toString())
+		picons.append(piconThumbnails.getThumbnail(picon, piconSize) if picon else picon)
+	return picons
+
+
+# If a "deferred" list is given only the first "budget" static parts that
+# aren't cached are built.  The other timers are appended to the list, as
+# (timer, revision, picon) tuples, and get the shared PLACEHOLDER_ROW.
+#
+def formatTimerList(timers, icons, piconSize=None, rowCache=None, fields=None, picons=None, deferred=None, budget=BACKGROUND_ROWS):
+	if fields is None:
+		fields = ALL_FIELDS
+	if picons is None:
+		picons = getPicons(timers, piconSize, fields)
+	plan = refreshPlan
+	snrLabel = plan.snrLabel
+	powerLabel = plan.powerLabel
+	dateFmt = plan.dateFmt
+	timeFmt = plan.timeFmt
+	if rowCache is None:
+		rowCache = TimerRowCache()
+	context = (icons, piconSize, fields, plan.textContext)
+	cache = rowCache.rows if rowCache.context == context else {}
+	rows = {}
+	tuner = not SIGNAL_FIELDS.isdisjoint(fields)
+	elapsed = not TIME_FIELDS.isdisjoint(fields)
+	timeFormats.validate()
+	now = time()
+	list = []
+	for timer, picon in zip(timers, picons):
+		revision = (timer.state, timer.disabled, timer.begin, timer.end, timer.name, timer.service_ref, picon, timer.prepare_time, timer.repeated, getattr(timer, "isAutoTimer", None), getattr(timer, "ice_timer_id", None), timer.tags and tuple(timer.tags), timer.description, timer.dirname)
+		entry = cache.get(id(timer))
+		if entry is None or entry.timer is not timer or entry.revision != revision:
+			if deferred is not None and budget <= 0:
+				deferred.append((timer, revision, picon))
+				list.append(PLACEHOLDER_ROW)
+				continue
+			budget -= 1
+			entry = TimerRow(timer, revision, formatStatic(timer, icons, picon, fields, dateFmt, timeFmt))
+		rows[id(timer)] = entry
+		list.append(entry.getRow(formatTuner(timer, fields, snrLabel, powerLabel) if tuner else NO_TUNER, formatElapsed(timer, fields, now) if elapsed else NO_ELAPSED))
+	rowCache.rows = rows
+	rowCache.context = context
+	return list
+
+
+def formatDuration(sign, value):
+	if value < 60:
+		format = ngettext("%s%d Sec", "%s%d Secs", value) % (sign, value)
+	else:
+		format = int(value // 60)
+		format = ngettext("%s%d Min", "%s%d Mins", format) % (sign, format)
+	return format
+
+
+def formatTimeWords(value):
+	return "%d Secs" % value if value < 60 else "%d Mins" % int(value / 60)
+
+
+def formatTimeHMS(value):
+	return None if value < 0 else "%d:%02d:%02d" % (value / 3600, value / 60 % 60, value % 60)
+
+
+def formatTimeMS(value):
+	return None if value < 0 else "%d:%02d" % (value / 60, value % 60)
+
+
+def formatTimeHM(value):
+	return None if value < 0 else "%d:%02d" % (value / 3600, value / 60 % 60)
+
+
+TIME_FORMATTERS = {
+	1: formatTimeHMS,
+	2: formatTimeMS,
+	3: formatTimeHM
+}
+
+ELAPSED_REMAINING_FORMATTERS = {  # Keyed by config.usage.swap_time_remaining_on_osd.
+	"0": lambda signElapsed, elapsed, signRemaining, remaining: formatDuration(signRemaining, remaining),
+	"1": lambda signElapsed, elapsed, signRemaining, remaining: formatDuration(signElapsed, elapsed),
+	"2": lambda signElapsed, elapsed, signRemaining, remaining: "%s%d %s%d Mins" % (signElapsed, int(elapsed // 60), signRemaining, int(remaining // 60)),
+	"3": lambda signElapsed, elapsed, signRemaining, remaining: "%s%d %s%d Mins" % (signRemaining, int(remaining // 60), signElapsed, int(elapsed // 60))
+}
+
+
+# The settings used by the timer list refreshes are compiled into a refresh
+# plan of ready to use values, labels and formatter functions so that the
+# refreshes, and the formatting of each row, don't walk the config tree.  The
+# plan is rebuilt by config notifiers whenever one of the settings changes.
+#
+class RefreshPlan:
+	def __init__(self):
+		self.build()
+		settings = config.plugins.InfoBarTimers
+		for element in (
+			settings.format, settings.signalIndex, settings.separatorIndex,
+			settings.endedOverlay, settings.waitingOverlay, settings.disabledOverlay, settings.orderOverlay, settings.sortOverlay, settings.refreshOverlay,
+			settings.endedShow, settings.waitingShow, settings.disabledShow, settings.orderShow, settings.sortShow, settings.refreshShow, settings.showOverlayList, settings.virtualShow,
+			settings.coalesceWindow, settings.coalesceLatency, settings.enabled, settings.style, settings.position, settings.profile,
+			config.usage.date.dayshort, config.usage.time.short, config.usage.elapsed_time_positive_osd, config.usage.swap_time_remaining_on_osd
+		):
+			element.addNotifier(self.build, initial_call=False)
+
+	def build(self, configElement=None):
+		settings = config.plugins.InfoBarTimers
+		self.format = settings.format.value
+		self.formatTime = TIME_FORMATTERS.get(self.format, formatTimeWords)
+		self.swap = config.usage.swap_time_remaining_on_osd.value
+		self.formatElapsedRemaining = ELAPSED_REMAINING_FORMATTERS.get(self.swap)
+		if self.formatElapsedRemaining is None:
+			print("[InfoBarTimers] Error: config.usage.swap_time_remaining_on_osd value is not within expected range!! (Value=%s)" % self.swap)
+			self.formatElapsedRemaining = lambda signElapsed, elapsed, signRemaining, remaining: None
+		if config.usage.elapsed_time_positive_osd.value:
+			self.signElapsed = "+"
+			self.signRemaining = "-"
+		else:
+			self.signElapsed = "-"
+			self.signRemaining = "+"
+		signal = settings.signalIndex.value
+		separator = LABEL_SEPARATORS[settings.separatorIndex.value] if signal else ""
+		self.snrLabel = (SNR_LABELS[signal], separator)
+		self.powerLabel = (POWER_LABELS[signal], separator)
+		self.dateFmt = config.usage.date.dayshort.value  # Set the display date format
+		self.timeFmt = config.usage.time.short.value  # Set the display time format
+		self.textContext = (self.dateFmt, self.timeFmt, self.format)
+		self.overlayQuotas = (settings.endedOverlay.value, settings.waitingOverlay.value, settings.disabledOverlay.value)
+		self.overlayOrder = (settings.orderOverlay.value, settings.sortOverlay.value)
+		self.overlayRefresh = settings.refreshOverlay.value
+		if settings.showOverlayList.value:
+			self.showQuotas = self.overlayQuotas
+		else:
+			self.showQuotas = (settings.endedShow.value, settings.waitingShow.value, settings.disabledShow.value)
+		self.showOrder = (settings.orderShow.value, settings.sortShow.value)
+		self.showRefresh = settings.refreshShow.value
+		self.virtualShow = settings.virtualShow.value
+		self.coalesceWindow = settings.coalesceWindow.value
+		self.coalesceLatency = settings.coalesceLatency.value
+		self.enabled = settings.enabled.value
+		self.style = settings.style.value
+		default = overlayPositions.get(DESKTOP_SIZE[1], [50, 140])
+		left, top = settings.position.value
+		self.overlayPosition = (left if left < DESKTOP_SIZE[0] else default[0], top if top < DESKTOP_SIZE[1] else default[1])
+		self.profile = settings.profile.value
+
+
+refreshPlan = RefreshPlan()
+
+
+# Formatted timestamps are remembered by timestamp and format string.  Date
+# only strings are also shared by all the timestamps on the same calendar day.
+# The memory is cleared when the date or time format settings or the timezone
+# change, or when it grows beyond "size" entries.
+#
+class TimeFormatCache:
+	def __init__(self, size=TIME_FORMAT_CACHE_SIZE):
+		self.size = size
+		self.times = {}
+		self.dates = {}
+		self.zone = None
+		config.usage.date.dayshort.addNotifier(self.clear, initial_call=False)
+		config.usage.time.short.addNotifier(self.clear, initial_call=False)
+
+	def clear(self, configElement=None):
+		self.times = {}
+		self.dates = {}
+
+	def validate(self):
+		zone = (timeModule.timezone, timeModule.altzone, timeModule.tzname)
+		if zone != self.zone:
+			self.zone = zone
+			self.clear()
+
+	def formatTime(self, timestamp, format):
+		key = (timestamp, format)
+		text = self.times.get(key)
+		if text is None:
+			if len(self.times) >= self.size:
+				self.times = {}
+			text = self.times[key] = strftime(format, localtime(timestamp))
+		return text
+
+	def formatDate(self, timestamp, format):
+		key = (timestamp, format)
+		text = self.times.get(key)
+		if text is None:
+			date = localtime(timestamp)
+			day = (date.tm_year, date.tm_yday, format)
+			text = self.dates.get(day)
+			if text is None:
+				if len(self.dates) >= self.size:
+					self.dates = {}
+				text = self.dates[day] = strftime(format, date)
+			if len(self.times) >= self.size:
+				self.times = {}
+			self.times[key] = text
+		return text
+
+
+timeFormats = TimeFormatCache()
+
+
+# Return template fields 0-3, 12-27 and 41-43.  Only the fields in the field
+# plan are calculated, the others are None.
+#
+def formatStatic(timer, icons, picon, fields, dateFmt, timeFmt):
+	return completeStatic(formatStaticText(timer, fields, dateFmt, timeFmt), timer, icons, picon, fields)
+
+
+# Return the static part of a row with the icon numbers in place of the state
+# and type icons and None for the service picon and name.  This only uses
+# Python code so it is safe to run in the background formatting threads.
+#
+def formatStaticText(timer, fields, dateFmt, timeFmt):
+	state = None
+	stateText = None
+	if 0 in fields or 1 in fields:
 		if timer.state == timer.StateWaiting:
-			state = icons.pixmaps[ICON_WAIT]
+			state = ICON_WAIT
 			stateText = _("Waiting")
 		elif timer.state == timer.StatePrepared:
-			state = icons.pixmaps[ICON_PREP]
+			state = ICON_PREP
 			stateText = _("Preparing")
 		elif timer.state == timer.StateRunning:
-			state = icons.pixmaps[ICON_REC]
+			state = ICON_REC
 			stateText = _("Recording")
 		elif timer.state == timer.StateFailed:
-			state = icons.pixmaps[ICON_FAIL]
+			state = ICON_FAIL
 			stateText = _("Failed")
 		elif timer.state == timer.StateEnded:
-			state = icons.pixmaps[ICON_END]
+			state = ICON_END
 			stateText = _("Ended")
 		else:
 			state = None
 			stateText = _("Unknown")
 		if timer.disabled:
-			state = icons.pixmaps[ICON_OFF]
+			state = ICON_OFF
 			stateText = _("Disabled")
+	type = None
+	typeText = None
+	if 2 in fields or 3 in fields:
 		if hasattr(timer, "isAutoTimer") and timer.isAutoTimer:
-			type = icons.pixmaps[ICON_AUTO]
+			type = ICON_AUTO
 			typeText = _("AutoTimer")
 		elif hasattr(timer, "ice_timer_id") and timer.ice_timer_id:
-			type = LoadPixmap(resolveFilename(SCOPE_CURRENT_SKIN, "icons/timer_icetv.png"))
-			if not type:
-				type = LoadPixmap(resolveFilename(SCOPE_CURRENT_PLUGIN, "SystemPlugins/IceTV/icons/timer_icetv.png"))
+			type = ICON_ICETV
 			typeText = _("IceTV")
 		elif timer.repeated:
-			type = icons.pixmaps[ICON_REP]
+			type = ICON_REP
 			typeText = _("Repeating")
 		else:
 			type = None
 			typeText = _("Timer")
-		feinfo = timer.record_service and timer.record_service.frontendInfo()
-		data = feinfo and feinfo.getAll(False)
+	timerName = timer.name if timer.name else None
+	prepare = formatDuration("", timer.prepare_time) if 15 in fields else None
+	begin = None
+	beginDate = None
+	beginTime = None
+	end = None
+	endDate = None
+	endTime = None
+	beginEnd = None
+	duration = None
+	durationWord = None
+	durationHrs = None
+	durationMins = None
+	durationSecs = None
+	if timer.begin and timer.end:
+		if 16 in fields or 22 in fields:
+			begin = timeFormats.formatTime(timer.begin, "%s %s" % (dateFmt, timeFmt))
+		if 17 in fields:
+			beginDate = timeFormats.formatDate(timer.begin, dateFmt)
+		if 18 in fields:
+			beginTime = timeFormats.formatTime(timer.begin, timeFmt)
+		if 19 in fields:
+			end = timeFormats.formatTime(timer.end, "%s %s" % (dateFmt, timeFmt))
+		if 20 in fields:
+			endDate = timeFormats.formatDate(timer.end, dateFmt)
+		if 21 in fields or 22 in fields:
+			endTime = timeFormats.formatTime(timer.end, timeFmt)
+		if 22 in fields:
+			beginEnd = "%s - %s" % (begin, endTime)
+		durationValue = timer.end - timer.begin
+		if 23 in fields:
+			duration = refreshPlan.formatTime(durationValue)
+		if 24 in fields:
+			durationWord = formatDuration("", durationValue)
+		if durationValue >= 0:
+			if 25 in fields:
+				durationHrs = "%d:%02d" % (durationValue // 3600, durationValue // 60 % 60)
+			if 26 in fields:
+				durationMins = "%d:%02d" % (durationValue // 60, durationValue % 60)
+			if 27 in fields:
+				durationSecs = "%d:%02d:%02d" % (durationValue // 3600, durationValue // 60 % 60, durationValue % 60)
+	tags = "'%s'" % "', '".join(timer.tags) if 41 in fields and timer.tags else None
+	description = timer.description if timer.description else None
+	dirName = timer.dirname if timer.dirname else None  # Custom directory
+	return (state, stateText, type, typeText,
+		None, None, timerName, prepare, begin, beginDate, beginTime, end, endDate, endTime, beginEnd,
+		duration, durationWord, durationHrs, durationMins, durationSecs,
+		tags, description, dirName)
+
+
+# Add the icons, service picon and service name, which all come from enigma2,
+# to the static part of a row built by formatStaticText().
+#
+def completeStatic(text, timer, icons, picon, fields):
+	state = icons.pixmaps[text[0]] if text[0] is not None else None
+	type = text[2]
+	if type == ICON_ICETV:
+		type = pixmapCache.load(resolveFilename(SCOPE_CURRENT_SKIN, "icons/timer_icetv.png"))
+		if not type:
+			type = pixmapCache.load(resolveFilename(SCOPE_CURRENT_PLUGIN, "SystemPlugins/IceTV/icons/timer_icetv.png"))
+	elif type is not None:
+		type = icons.pixmaps[type]
+	servicePicon = pixmapCache.load(picon) if picon else None
+	serviceName = timer.service_ref.getServiceName() if 13 in fields and timer.service_ref else None
+	return (state, text[1], type, text[3], servicePicon, serviceName) + text[6:]
+
+
+# Each tuner in use by a recording is queried at most once per "interval"
+# seconds no matter how many timers share it or how many screens display it.
+# The SNR, AGC and BER readings of every query are also kept in a fixed size
+# history per tuner.
+#
+class TunerSignalSampler:
+	def __init__(self, interval=SIGNAL_SAMPLE_INTERVAL, size=SIGNAL_HISTORY_SIZE):
+		self.interval = interval
+		self.size = size
+		self.samples = {}
+		self.history = {}
+		self.queries = 0
+
+	def getData(self, service):
+		feinfo = service and service.frontendInfo()
+		if not feinfo:
+			return None
+		key = feinfo.getFrontendInfo(iFrontendInformation.frontendNumber)
+		now = time()
+		sample = self.samples.get(key)
+		if sample and now - sample[0] < self.interval:
+			return sample[1]
+		self.queries += 1
+		data = feinfo.getAll(False)
+		self.samples[key] = (now, data)
 		if data:
-			tuner = data.get("tuner_number", -1)
-			tuner = chr(int(tuner) + ord("A")) if tuner is not None and tuner > -1 else None
-			tunerType = data.get("tuner_type", None)
-			ber = data.get("tuner_bit_error_rate", None)
-			snrValue = data.get("tuner_signal_quality", None)
-			if snrValue is not None:
-				snrValue = int(snrValue * 100 / 65535)
-				snr = "%s%s%d%%" % (snrLabels[signal], separator, snrValue)
-			else:
-				snrValue = -1  # Use an out-out-of range value to hide the bar graph.
-				snr = None
-			snr_dB = data.get("tuner_signal_quality_db", None)
-			if snr_dB is not None:
-				snr_dB = "%.1f" % (snr_dB / 100.0)
-			powerValue = data.get("tuner_signal_power", None)
-			if powerValue is not None:
-				powerValue = int(powerValue * 100 / 65535)
-				power = "%s%s%d%%" % (powerLabels[signal], separator, powerValue)
-			else:
-				powerValue = -1  # Use an out-out-of range value to hide the bar graph.
-				power = None
+			history = self.history.get(key)
+			if history is None:
+				history = self.history[key] = deque(maxlen=self.size)
+			history.append((now, data.get("tuner_signal_quality", None), data.get("tuner_signal_power", None), data.get("tuner_bit_error_rate", None)))
+		return data
+
+	def getHistory(self, tuner):  # Return a list of (time, SNR, AGC, BER) readings, oldest first.
+		return list(self.history.get(tuner, ()))
+
+	def getSummary(self, tuner, index=1):  # Return the (minimum, average, maximum) of a history reading.
+		values = [x[index] for x in self.history.get(tuner, ()) if x[index] is not None]
+		return (min(values), sum(values) // len(values), max(values)) if values else None
+
+
+signalSampler = TunerSignalSampler()
+
+
+# Return template fields 4-11.
+#
+def formatTuner(timer, fields, snrLabel, powerLabel):
+	data = signalSampler.getData(timer.record_service)
+	if data:
+		tuner = data.get("tuner_number", -1)
+		tuner = chr(int(tuner) + ord("A")) if tuner is not None and tuner > -1 else None
+		tunerType = data.get("tuner_type", None)
+		ber = data.get("tuner_bit_error_rate", None)
+		snrValue = data.get("tuner_signal_quality", None)
+		if snrValue is not None:
+			snrValue = int(snrValue * 100 / 65535)
+			snr = "%s%s%d%%" % (snrLabel + (snrValue,)) if 8 in fields else None
 		else:
-			tuner = None
-			tunerType = None
-			ber = None
 			snrValue = -1  # Use an out-out-of range value to hide the bar graph.
 			snr = None
-			snr_dB = None
+		snr_dB = data.get("tuner_signal_quality_db", None)
+		if snr_dB is not None:
+			snr_dB = "%.1f" % (snr_dB / 100.0) if 9 in fields else None
+		powerValue = data.get("tuner_signal_power", None)
+		if powerValue is not None:
+			powerValue = int(powerValue * 100 / 65535)
+			power = "%s%s%d%%" % (powerLabel + (powerValue,)) if 11 in fields else None
+		else:
 			powerValue = -1  # Use an out-out-of range value to hide the bar graph.
 			power = None
-		picon = getPiconName(timer.service_ref.ref.toString())
-		if picon == "":
-			servicePicon = None
-		else:
-			servicePicon = LoadPixmap(picon)
-		serviceName = timer.service_ref.getServiceName() if timer.service_ref else None
-		timerName = timer.name if timer.name else None
-		prepare = formatDuration("", timer.prepare_time)
-		if timer.begin and timer.end:
-			dateFmt = config.usage.date.dayshort.value  # Set the display date format
-			timeFmt = config.usage.time.short.value  # Set the display time format
-			begin = strftime("%s %s" % (dateFmt, timeFmt), localtime(timer.begin))
-			beginDate = strftime(dateFmt, localtime(timer.begin))
-			beginTime = strftime(timeFmt, localtime(timer.begin))
-			end = strftime("%s %s" % (dateFmt, timeFmt), localtime(timer.end))
-			endDate = strftime(dateFmt, localtime(timer.end))
-			endTime = strftime(timeFmt, localtime(timer.end))
-			beginEnd = "%s - %s" % (begin, strftime(timeFmt, localtime(timer.end)))
-			durationValue = timer.end - timer.begin
-			duration = formatTime(durationValue)
-			durationWord = formatDuration("", durationValue)
-			durationHrs = None if durationValue < 0 else "%d:%02d" % (durationValue // 3600, durationValue // 60 % 60)
-			durationMins = None if durationValue < 0 else "%d:%02d" % (durationValue // 60, durationValue % 60)
-			durationSecs = None if durationValue < 0 else "%d:%02d:%02d" % (durationValue // 3600, durationValue // 60 % 60, durationValue % 60)
-			now = time()
-			if timer.begin <= now <= timer.end:
-				if config.usage.elapsed_time_positive_osd.value:
-					signElapsed = "+"
-					signRemaining = "-"
-				else:
-					signElapsed = "-"
-					signRemaining = "+"
-				elapsedValue = now - timer.begin
-				elapsed = formatTime(elapsedValue)
-				elapsedWord = formatDuration(signElapsed, elapsedValue)
-				elapsedHrs = None if elapsedValue < 0 else "%s%d:%02d" % (signElapsed, elapsedValue // 3600, elapsedValue // 60 % 60)
-				elapsedMins = None if elapsedValue < 0 else "%s%d:%02d" % (signElapsed, elapsedValue // 60, elapsedValue % 60)
-				elapsedSecs = None if elapsedValue < 0 else "%s%d:%02d:%02d" % (signElapsed, elapsedValue // 3600, elapsedValue // 60 % 60, elapsedValue % 60)
-				remainingValue = timer.end - now
-				remaining = formatTime(remainingValue)
-				remainingWord = formatDuration(signRemaining, remainingValue)
-				remainingHrs = None if remainingValue < 0 else "%s%d:%02d" % (signRemaining, remainingValue // 3600, remainingValue // 60 % 60)
-				remainingMins = None if remainingValue < 0 else "%s%d:%02d" % (signRemaining, remainingValue // 60, remainingValue % 60)
-				remainingSecs = None if remainingValue < 0 else "%s%d:%02d:%02d" % (signRemaining, remainingValue // 3600, remainingValue // 60 % 60, remainingValue % 60)
-				format = config.usage.swap_time_remaining_on_osd.value
-				if format == "0":
-					elapsedRemaining = formatDuration(signRemaining, remainingValue)
-				elif format == "1":
-					elapsedRemaining = formatDuration(signElapsed, elapsedValue)
-				elif format == "2":
-					elapsedRemaining = formatDuration(signElapsed, elapsedValue)
-					elapsedRemaining = "%s%d %s%d Mins" % (signElapsed, int(elapsedValue // 60), signRemaining, int(remainingValue // 60))
-				elif format == "3":
-					elapsedRemaining = "%s%d %s%d Mins" % (signRemaining, int(remainingValue // 60), signElapsed, int(elapsedValue // 60))
-				else:
-					print("[InfoBarTimers] Error: config.usage.swap_time_remaining_on_osd value is not within expected range!! (Value=%s)" % config.usage.swap_time_remaining_on_osd.value)
-					elapsedRemaining = None
-				progressValue = int(elapsedValue / durationValue * 100.0)
-				if progressValue < 0:
-					progressValue = 0
-				elif progressValue > 100:
-					progressValue = 100
-				progress = "%d%%" % progressValue
-			else:
-				elapsed = None
-				elapsedWord = None
-				elapsedHrs = None
-				elapsedMins = None
-				elapsedSecs = None
-				remaining = None
-				remainingWord = None
-				remainingHrs = None
-				remainingMins = None
-				remainingSecs = None
-				elapsedRemaining = None
-				progressValue = -1  # Use an out-out-of range value to hide the bar graph.
-				progress = None
-		else:
-			begin = None
-			beginDate = None
-			beginTime = None
-			end = None
-			endDate = None
-			endTime = None
-			beginEnd = None
-			duration = None
-			durationWord = None
-			durationHrs = None
-			durationMins = None
-			durationSecs = None
-			elapsed = None
-			elapsedWord = None
-			elapsedHrs = None
-			elapsedMins = None
-			elapsedSecs = None
-			remaining = None
-			remainingWord = None
-			remainingHrs = None
-			remainingMins = None
-			remainingSecs = None
-			elapsedRemaining = None
-			progressValue = -1  # Use an out-out-of range value to hide the bar graph
-			progress = None
-		tags = "'%s'" % "', '".join(timer.tags) if timer.tags else None
-		description = timer.description if timer.description else None
-		dirName = timer.dirname if timer.dirname else None  # Custom directory
-		list.append(
-			(state, stateText, type, typeText, tuner, tunerType, ber, snrValue, snr, snr_dB, powerValue, power,
-			servicePicon, serviceName, timerName, prepare, begin, beginDate, beginTime, end, endDate, endTime, beginEnd,
-			duration, durationWord, durationHrs, durationMins, durationSecs, elapsed, elapsedWord, elapsedHrs, elapsedMins, elapsedSecs,
-			remaining, remainingWord, remainingHrs, remainingMins, remainingSecs, elapsedRemaining, progressValue, progress,
-			tags, description, dirName)
-		)
-	return list
+		return (tuner, tunerType, ber, snrValue, snr, snr_dB, powerValue, power)
+	return NO_TUNER
+
+
+# Return template fields 28-40.  Only the fields in the field plan are
+# calculated, the others are None.
+#
+def formatElapsed(timer, fields, now):
+	if not (timer.begin and timer.end and timer.begin <= now <= timer.end):
+		return NO_ELAPSED
+	plan = refreshPlan
+	formatTime = plan.formatTime
+	signElapsed = plan.signElapsed
+	signRemaining = plan.signRemaining
+	durationValue = timer.end - timer.begin
+	elapsedValue = now - timer.begin
+	remainingValue = timer.end - now
+	elapsed = formatTime(elapsedValue) if 28 in fields else None
+	elapsedWord = formatDuration(signElapsed, elapsedValue) if 29 in fields else None
+	elapsedHrs = "%s%d:%02d" % (signElapsed, elapsedValue // 3600, elapsedValue // 60 % 60) if 30 in fields else None
+	elapsedMins = "%s%d:%02d" % (signElapsed, elapsedValue // 60, elapsedValue % 60) if 31 in fields else None
+	elapsedSecs = "%s%d:%02d:%02d" % (signElapsed, elapsedValue // 3600, elapsedValue // 60 % 60, elapsedValue % 60) if 32 in fields else None
+	remaining = formatTime(remainingValue) if 33 in fields else None
+	remainingWord = formatDuration(signRemaining, remainingValue) if 34 in fields else None
+	remainingHrs = "%s%d:%02d" % (signRemaining, remainingValue // 3600, remainingValue // 60 % 60) if 35 in fields else None
+	remainingMins = "%s%d:%02d" % (signRemaining, remainingValue // 60, remainingValue % 60) if 36 in fields else None
+	remainingSecs = "%s%d:%02d:%02d" % (signRemaining, remainingValue // 3600, remainingValue // 60 % 60, remainingValue % 60) if 37 in fields else None
+	elapsedRemaining = plan.formatElapsedRemaining(signElapsed, elapsedValue, signRemaining, remainingValue) if 38 in fields else None
+	progressValue = int(elapsedValue / durationValue * 100.0)
+	if progressValue < 0:
+		progressValue = 0
+	elif progressValue > 100:
+		progressValue = 100
+	progress = "%d%%" % progressValue if 40 in fields else None
+	return (elapsed, elapsedWord, elapsedHrs, elapsedMins, elapsedSecs, remaining, remainingWord, remainingHrs, remainingMins, remainingSecs, elapsedRemaining, progressValue, progress)
 
 
 def setup(session, **kwargs):